@@ -0,0 +1,103 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from scraper import canonical_place_id
+from metrics import LINKS_FOUND, record_failure
+
+
+class BatchScraper:
+    """Scrape many related queries, extracting every unique place exactly once
+
+    Links are harvested for all queries first; the union of places is then
+    interleaved round-robin across queries so every query's top results come
+    early, and each record lists every query that found it in matched_queries.
+    """
+
+    def __init__(self, queries, extractor):
+        # queries: list of (search_query, max_results)
+        self.queries = queries
+        self.extractor = extractor
+        self.place_queries = {}
+
+    def harvest(self):
+        """Place links per query, harvested on up to detail_workers drivers"""
+        lead = self.extractor
+        harvesters = [lead]
+        for _ in range(min(lead.detail_workers, len(self.queries)) - 1):
+            try:
+                harvesters.append(lead.spawn_worker())
+            except Exception as e:
+                print(f"Harvest worker setup error: {e}")
+                break
+
+        tasks = queue.Queue()
+        for item in enumerate(self.queries):
+            tasks.put(item)
+        links_by_query = [[] for _ in self.queries]
+
+        def work(harvester):
+            while not lead.cancelled():
+                try:
+                    query_index, (search_query, max_results) = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                harvester.search_query = search_query
+                harvester.max_results = max_results
+                links_by_query[query_index] = harvester.harvest_links() or []
+                print(f"Harvested {len(links_by_query[query_index])} links for '{search_query}'")
+                harvester.pacer.pause()
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(harvesters)) as executor:
+                list(executor.map(work, harvesters))
+        finally:
+            for harvester in harvesters[1:]:
+                lead.release_worker(harvester)
+        return links_by_query
+
+    def schedule(self, links_by_query):
+        """Unique place links, taking one from each query in turn"""
+        order = []
+        longest = max((len(links) for links in links_by_query), default=0)
+        for rank in range(longest):
+            for query_index, links in enumerate(links_by_query):
+                if rank >= len(links):
+                    continue
+                place_id = canonical_place_id(links[rank])
+                search_query = self.queries[query_index][0]
+                if place_id not in self.place_queries:
+                    self.place_queries[place_id] = []
+                    order.append(links[rank])
+                if search_query not in self.place_queries[place_id]:
+                    self.place_queries[place_id].append(search_query)
+        return order
+
+    def run(self, on_record=None):
+        """Batch counterpart of AdvancedContactExtractor.run_extraction"""
+        lead = self.extractor
+        indexed = []
+        try:
+            order = self.schedule(self.harvest())
+            lead.links_found = len(order)
+            LINKS_FOUND.inc(len(order))
+            print(f"{len(order)} unique places across {len(self.queries)} queries")
+
+            pending = [(index, link, 0) for index, link in enumerate(order)]
+            for index, business_data in lead.iter_details(pending):
+                matched_queries = self.place_queries[canonical_place_id(order[index])]
+                business_data.search_query = matched_queries[0]
+                business_data.matched_queries = matched_queries
+                if on_record is not None:
+                    on_record(index, business_data)
+                else:
+                    indexed.append((index, business_data))
+                    lead.results.append(business_data)
+
+        except Exception as e:
+            print(f"Batch extraction error: {e}")
+            record_failure('batch', e)
+        finally:
+            lead.cleanup()
+
+        indexed.sort(key=lambda item: item[0])
+        lead.results[:] = [business_data for index, business_data in indexed]
+        return lead.results
@@ -0,0 +1,153 @@
+"""Offline benchmark of contact extraction over the saved pages in benchmarks/corpus
+
+Compares contact_extractor.extract_contacts against the previous per-instance
+regex implementation, reporting throughput (MB/s) and precision/recall against
+the expected contacts stored next to each page as <name>.json.
+
+The corpus is synthetic: small hand-written pages in the shape of common
+business sites, labelled by hand. A contact counts as expected when a visitor
+would see it (page text, mailto:/tel: links); addresses that only appear inside
+scripts or styles are labelled as not expected, which is the rule the current
+extractor was written to. Precision/recall therefore measure agreement with
+those labels, not accuracy on real sites; the throughput figures are the
+meaningful part. Add captured pages with their own labels to widen it.
+
+    python benchmarks/bench_contacts.py [--repeat 20]
+    pytest benchmarks/ --benchmark-only    (see test_bench_contacts.py)
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_extractor import extract_contacts
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+LEGACY_EMAIL_PATTERNS = [
+    re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    re.compile(r'mailto:([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})'),
+    re.compile(r'email[:\s]*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})', re.IGNORECASE),
+]
+
+LEGACY_PHONE_PATTERNS = [
+    re.compile(r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'),
+    re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    re.compile(r'\(\d{3}\)\s?\d{3}[-.]?\d{4}'),
+    re.compile(r'tel[:\s]*(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', re.IGNORECASE),
+]
+
+
+def legacy_extract_contacts(text):
+    """AdvancedContactExtractor.extract_contacts_from_text before contact_extractor
+
+    The [:3] caps are dropped so recall measures extraction, not truncation.
+    """
+    emails = set()
+    phones = set()
+
+    for pattern in LEGACY_EMAIL_PATTERNS:
+        for match in pattern.findall(text):
+            if isinstance(match, tuple):
+                emails.update(match)
+            else:
+                emails.add(match)
+
+    for pattern in LEGACY_PHONE_PATTERNS:
+        for match in pattern.findall(text):
+            if isinstance(match, tuple):
+                phone = ''.join(match)
+                if len(phone) >= 10:
+                    phones.add(phone)
+            else:
+                clean_phone = re.sub(r'[^\d]', '', match)
+                if len(clean_phone) >= 10:
+                    phones.add(match)
+
+    valid_emails = []
+    for email in emails:
+        email = email.strip().lower()
+        if '@' in email and '.' in email and len(email) > 5:
+            if not any(domain in email for domain in ['noreply', 'donotreply', 'no-reply']):
+                valid_emails.append(email)
+
+    valid_phones = []
+    for phone in phones:
+        clean_phone = re.sub(r'[^\d+]', '', phone)
+        if len(clean_phone) >= 10 and len(clean_phone) <= 15:
+            if len(clean_phone) == 10:
+                valid_phones.append(f"({clean_phone[:3]}) {clean_phone[3:6]}-{clean_phone[6:]}")
+            elif len(clean_phone) == 11 and clean_phone.startswith('1'):
+                valid_phones.append(f"({clean_phone[1:4]}) {clean_phone[4:7]}-{clean_phone[7:]}")
+
+    return {'emails': list(set(valid_emails)), 'phones': list(set(valid_phones))}
+
+
+def current_extract_contacts(text):
+    return extract_contacts(text, limit=None)
+
+
+def comparable(contacts):
+    """Emails lower-cased, phones reduced to digits, so formatting differences don't count"""
+    emails = {email.lower() for email in contacts['emails']}
+    phones = {re.sub(r'\D', '', phone) for phone in contacts['phones']}
+    return emails | {"tel:" + phone for phone in phones}
+
+
+def load_corpus():
+    pages = []
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+            page = f.read()
+        with open(os.path.join(CORPUS_DIR, name[:-5] + ".json"), encoding="utf-8") as f:
+            expected = comparable(json.load(f))
+        pages.append((name, page, expected))
+    return pages
+
+
+def run(extract, pages, repeat):
+    found = {}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name, page, expected in pages:
+            found[name] = comparable(extract(page))
+    elapsed = time.perf_counter() - started
+
+    total_bytes = sum(len(page.encode("utf-8")) for name, page, expected in pages) * repeat
+    true_positives = sum(len(found[name] & expected) for name, page, expected in pages)
+    predicted = sum(len(found[name]) for name, page, expected in pages)
+    relevant = sum(len(expected) for name, page, expected in pages)
+    return {
+        "mb_per_s": total_bytes / 1e6 / elapsed if elapsed else float("inf"),
+        "precision": true_positives / predicted if predicted else 1.0,
+        "recall": true_positives / relevant if relevant else 1.0,
+        "found": found,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the corpus per implementation")
+    parser.add_argument("--verbose", action="store_true", help="print per-page misses and false positives")
+    args = parser.parse_args()
+
+    pages = load_corpus()
+    print(f"Corpus: {len(pages)} pages, {sum(len(page) for _, page, _ in pages) / 1e6:.2f} MB")
+    print(f"{'implementation':<12} {'MB/s':>8} {'precision':>10} {'recall':>8}")
+    for label, extract in (("legacy", legacy_extract_contacts), ("current", current_extract_contacts)):
+        result = run(extract, pages, args.repeat)
+        print(f"{label:<12} {result['mb_per_s']:>8.2f} {result['precision']:>10.2f} {result['recall']:>8.2f}")
+        if args.verbose:
+            for name, page, expected in pages:
+                found = result["found"][name]
+                print(f"  {name}: missed {sorted(expected - found)}, extra {sorted(found - expected)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""End-to-end scrape throughput against the local fake Maps server
+
+Runs AdvancedContactExtractor.run_extraction and/or the /scrape endpoint against
+benchmarks/fake_maps.py with real headless Chrome, and reports businesses per
+minute, p50/p95 place latency and peak memory / CPU of the Chrome processes.
+Each run is appended to benchmarks/results/e2e.jsonl so runs can be compared.
+
+    python benchmarks/bench_e2e.py --mode both --places 100 --latency-ms 100 --detail-workers 2
+    python benchmarks/bench_e2e.py --compare
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_maps import FakeMaps, start_server
+from driver_pool import process_tree_pids, process_cpu_seconds, process_tree_rss
+
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "e2e.jsonl")
+
+
+class ChromeSampler:
+    """Samples memory and CPU of the Chrome processes started by this benchmark
+
+    CPU is tracked per process so drivers that quit mid-run still count.
+    """
+
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.peak_rss = 0
+        self.cpu_by_pid = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        own_pid = os.getpid()
+        children = [pid for pid in process_tree_pids(own_pid) if pid != own_pid]
+        self.peak_rss = max(self.peak_rss, process_tree_rss(own_pid) - own_rss())
+        for pid in children:
+            self.cpu_by_pid[pid] = max(self.cpu_by_pid.get(pid, 0.0), process_cpu_seconds(pid))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def stats(self):
+        return {
+            "chrome_peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+            "chrome_cpu_seconds": round(sum(self.cpu_by_pid.values()), 2),
+        }
+
+
+def own_rss():
+    """RSS of the benchmark process itself, excluding its children"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def summarize(mode, args, businesses, seconds, timings, sampler, fake):
+    place_timings = timings.get("place_details", {})
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "commit": git_commit(),
+        "mode": mode,
+        "config": {
+            "places": args.places,
+            "latency_ms": args.latency_ms,
+            "page_kb": args.page_kb,
+            "detail_workers": args.detail_workers,
+            "visit_websites": not args.skip_websites,
+        },
+        "businesses": businesses,
+        "seconds": round(seconds, 2),
+        "businesses_per_minute": round(businesses / seconds * 60, 1) if seconds else 0.0,
+        "place_p50": place_timings.get("p50"),
+        "place_p95": place_timings.get("p95"),
+        "requests_served": fake.requests,
+        **sampler.stats(),
+    }
+
+
+def run_extractor(args, base_url, fake):
+    from scraper import AdvancedContactExtractor
+
+    with ChromeSampler() as sampler:
+        extractor = AdvancedContactExtractor(
+            search_query=args.query,
+            max_results=args.places,
+            visit_websites=not args.skip_websites,
+            detail_workers=args.detail_workers,
+            cache_mode="bypass",
+            maps_base_url=base_url,
+        )
+        started = time.perf_counter()
+        results = extractor.run_extraction()
+        seconds = time.perf_counter() - started
+    return summarize("extractor", args, len(results), seconds, extractor.timer.breakdown(), sampler, fake)
+
+
+def run_api(args, base_url, fake):
+    from fastapi.testclient import TestClient
+    import main
+
+    request = {
+        "search_query": args.query,
+        "max_results": args.places,
+        "visit_websites": not args.skip_websites,
+        "detail_workers": args.detail_workers,
+        "cache_mode": "bypass",
+        "include_timings": True,
+    }
+    with TestClient(main.app) as client, ChromeSampler() as sampler:
+        started = time.perf_counter()
+        response = client.post("/scrape", json=request)
+        seconds = time.perf_counter() - started
+    response.raise_for_status()
+    body = response.json()
+    return summarize("api", args, len(body["data"]), seconds, body.get("timings", {}), sampler, fake)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(result, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def compare(path, last):
+    if not os.path.exists(path):
+        print(f"No results in {path}")
+        return
+    with open(path) as f:
+        runs = [json.loads(line) for line in f if line.strip()][-last:]
+
+    print(f"{'timestamp':<20} {'commit':<9} {'label':<14} {'mode':<9} {'places':>6} {'workers':>7} "
+          f"{'biz/min':>8} {'p50 s':>6} {'p95 s':>6} {'RSS MB':>7} {'CPU s':>7}")
+    for run in runs:
+        config = run["config"]
+        print(f"{run['timestamp']:<20} {run['commit'] or '-':<9} {(run['label'] or '-')[:14]:<14} "
+              f"{run['mode']:<9} {config['places']:>6} {config['detail_workers']:>7} "
+              f"{run['businesses_per_minute']:>8} {run['place_p50'] or 0:>6} {run['place_p95'] or 0:>6} "
+              f"{run['chrome_peak_rss_mb']:>7} {run['chrome_cpu_seconds']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end scraper benchmark against a fake Maps server")
+    parser.add_argument("--mode", choices=["extractor", "api", "both"], default="extractor")
+    parser.add_argument("--places", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=10, help="places added per feed scroll")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--page-kb", type=int, default=50)
+    parser.add_argument("--detail-workers", type=int, default=1)
+    parser.add_argument("--skip-websites", action="store_true")
+    parser.add_argument("--query", default="fixture businesses")
+    parser.add_argument("--label", default=None, help="name for this run in comparisons")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--compare", action="store_true", help="print stored runs and exit")
+    parser.add_argument("--last", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.output, args.last)
+        return
+
+    fake = FakeMaps(places=args.places, batch=args.batch, latency_ms=args.latency_ms, page_kb=args.page_kb)
+    server, base_url = start_server(fake)
+
+    # The API reads its settings at import; keep its state out of the working directory
+    state_dir = tempfile.mkdtemp(prefix="bench-e2e-")
+    os.environ["MAPS_BASE_URL"] = base_url
+    os.environ.setdefault("DRIVER_POOL_SIZE", str(args.detail_workers))
+    os.environ.setdefault("MAX_DETAIL_WORKERS", str(args.detail_workers))
+    os.environ.setdefault("CACHE_PATH", os.path.join(state_dir, "cache.db"))
+    os.environ.setdefault("JOURNAL_PATH", os.path.join(state_dir, "jobs.db"))
+    os.environ.setdefault("WORK_QUEUE_URL", f"sqlite:///{os.path.join(state_dir, 'queue.db')}")
+
+    runners = {"extractor": run_extractor, "api": run_api}
+    modes = ["extractor", "api"] if args.mode == "both" else [args.mode]
+    try:
+        for mode in modes:
+            fake.requests = 0
+            result = runners[mode](args, base_url, fake)
+            save(result, args.output)
+            print(f"{mode}: {result['businesses']} businesses in {result['seconds']}s "
+                  f"({result['businesses_per_minute']}/min), place p50 {result['place_p50']}s "
+                  f"p95 {result['place_p95']}s, Chrome peak {result['chrome_peak_rss_mb']} MB, "
+                  f"{result['chrome_cpu_seconds']} CPU s")
+    finally:
+        server.shutdown()
+    print(f"Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Offline check and benchmark of the browserless results-feed harvester
+
+Parses the payloads in benchmarks/payloads against the expected place ids and
+first entry stored next to each as <name>.json (payloads marked "unrecognized"
+must be rejected, which sends scrapes back to the browser), then harvests links
+from the fake Maps server over HTTP and reports parse MB/s and links/s.
+
+    python benchmarks/bench_feed.py [--repeat 50] [--places 200]
+    pytest benchmarks/test_feed_payloads.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from feed_client import FeedClient, parse_search_payload, UnrecognizedPayload
+from fake_maps import FakeMaps, start_server
+from scraper import canonical_place_id
+
+PAYLOAD_DIR = os.path.join(BENCH_DIR, "payloads")
+
+
+def load_payloads():
+    """(name, payload text, expectations) for every payload fixture"""
+    payloads = []
+    for name in sorted(os.listdir(PAYLOAD_DIR)):
+        if not name.endswith(".txt"):
+            continue
+        with open(os.path.join(PAYLOAD_DIR, name), encoding="utf-8") as f:
+            text = f.read()
+        with open(os.path.join(PAYLOAD_DIR, name[:-4] + ".json"), encoding="utf-8") as f:
+            expected = json.load(f)
+        payloads.append((name, text, expected))
+    return payloads
+
+
+def payload_matches(entries, expected):
+    """Whether parsed entries have the expected place ids and first entry"""
+    ids = [entry["feature_id"] for entry in entries]
+    first = {field: entries[0][field] for field in expected["first"]} if entries else None
+    return not expected.get("unrecognized") and ids == expected["feature_ids"] and first == expected["first"]
+
+
+def check_payloads(repeat):
+    failures = 0
+    total_bytes = 0
+    total_seconds = 0.0
+    for name, text, expected in load_payloads():
+        try:
+            entries = parse_search_payload(text)
+        except UnrecognizedPayload as e:
+            ok = expected.get("unrecognized", False)
+            print(f"{'ok  ' if ok else 'FAIL'} {name}: rejected ({e})")
+            failures += not ok
+            continue
+
+        ok = payload_matches(entries, expected)
+        failures += not ok
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parse_search_payload(text)
+        total_seconds += time.perf_counter() - started
+        total_bytes += len(text.encode("utf-8")) * repeat
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {len(entries)} places")
+
+    if total_seconds:
+        print(f"Parse throughput: {total_bytes / total_seconds / 1024 / 1024:.1f} MB/s")
+    return failures
+
+
+def check_harvest(places, latency_ms):
+    fake = FakeMaps(places=places, batch=20, latency_ms=latency_ms)
+    server, base_url = start_server(fake)
+    try:
+        started = time.perf_counter()
+        links = FeedClient().harvest(base_url, "fixture businesses", places)
+        seconds = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    expected = [f"0x{index:x}:0x{index:x}" for index in range(places)]
+    ok = [canonical_place_id(link) for link in links] == expected
+    print(f"{'ok  ' if ok else 'FAIL'} harvested {len(links)} of {places} links over HTTP in {seconds:.2f}s "
+          f"({len(links) / seconds:.0f} links/s, {fake.requests} requests)")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Results feed harvester check")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--places", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    failures = check_payloads(args.repeat) + check_harvest(args.places, args.latency_ms)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
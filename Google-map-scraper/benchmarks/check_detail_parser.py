@@ -0,0 +1,59 @@
+"""Offline check of detail_parser.parse_business_page against saved place pages
+
+Every benchmarks/corpus/<page>.html with a <page>.fields.json next to it is
+parsed and compared field by field with the expected values.
+
+    python benchmarks/check_detail_parser.py
+    pytest benchmarks/test_detail_parser.py
+"""
+import json
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from detail_parser import parse_business_page, SELECTOR_VERSION
+
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+
+
+def load_pages():
+    """(page name, html, expected fields) for every place page with expectations"""
+    pages = []
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if not name.endswith(".fields.json"):
+            continue
+        page = name[:-len(".fields.json")]
+        with open(os.path.join(CORPUS_DIR, page + ".html"), encoding="utf-8") as f:
+            html = f.read()
+        with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+            expected = json.load(f)
+        pages.append((page, html, expected))
+    return pages
+
+
+def wrong_fields(html, expected):
+    """{field: (parsed, expected)} for every field the parser got wrong"""
+    parsed = parse_business_page(html)
+    return {field: (parsed.get(field), value) for field, value in expected.items() if parsed.get(field) != value}
+
+
+def check_pages():
+    failures = 0
+    for page, html, expected in load_pages():
+        wrong = wrong_fields(html, expected)
+        failures += bool(wrong)
+        print(f"{'FAIL' if wrong else 'ok  '} {page}.html")
+        for field, (got, want) in wrong.items():
+            print(f"     {field}: got {got!r}, expected {want!r}")
+    return failures
+
+
+def main():
+    print(f"Selector version {SELECTOR_VERSION}")
+    sys.exit(1 if check_pages() else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The tests import the scraper modules from the repository root and the
+# fixture helpers next to them, as the standalone scripts in here do
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
@@ -0,0 +1,286 @@
+"""Local stand-in for Google Maps and business websites, for offline benchmarks
+
+Serves a results feed that grows on scroll and ends with an end-of-list marker,
+the JSON search payload behind it (for the direct harvest mode), place pages
+carrying the markup detail_parser reads, and one small website with a contact
+page per business. Pages pull in the kinds of resources the blocking profiles
+target (stylesheet, web font, photos, map tiles and a tracking beacon), each
+counted per kind in asset_requests. Latency and page size are configurable.
+
+    python benchmarks/fake_maps.py --places 200 --latency-ms 150 --page-kb 200
+
+then point the scraper at it with MAPS_BASE_URL=http://127.0.0.1:8765/maps.
+"""
+import argparse
+import html
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FILLER = ("Fixture text standing in for the reviews, photos and opening hours "
+          "a real page carries, so page weight can be tuned. ")
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>{query} - Fake Maps</title>
+<link rel="stylesheet" href="/static/fixture.css">
+<link href="/search?tbm=map&amp;hl=en&amp;pb=!4m9!1m3!1d4000!2d0!3d0!7i{batch}!8i0&amp;q={query}" as="fetch" rel="preload">
+</head>
+<body>
+<div class="map"><img src="/maps/vt?pb=!1m4!1i12!2i0!3i0" alt=""><img src="/maps/vt?pb=!1m4!1i12!2i1!3i0" alt=""></div>
+<div role="main">
+  <div class="m6QErb" style="height: 600px; overflow-y: auto;">
+    <div role="feed">{items}</div>
+  </div>
+</div>
+<script>
+const panel = document.querySelector('.m6QErb');
+const feed = document.querySelector('[role=feed]');
+let offset = {next_offset};
+let loading = false;
+let ended = {ended};
+panel.addEventListener('scroll', async () => {{
+  if (loading || ended) {{ return; }}
+  loading = true;
+  const response = await fetch('/maps/feed?offset=' + offset);
+  const fragment = await response.text();
+  feed.insertAdjacentHTML('beforeend', fragment);
+  offset += {batch};
+  ended = fragment.includes('end of the list');
+  loading = false;
+}});
+</script>
+</body></html>"""
+
+FEED_ITEM = """<div class="Nv2PK" style="height: 80px;">
+  <a class="hfpxzc" href="/maps/place/Fixture+Business+{index}/data=!4m2!3m1!1s0x{index:x}:0x{index:x}"
+     aria-label="Fixture Business {index}"></a>
+  <div class="qBF1Pd">Fixture Business {index}</div>
+</div>"""
+
+END_OF_LIST = """<p class="HlvSq">You've reached the end of the list.</p>"""
+
+PLACE_PAGE = """<!DOCTYPE html>
+<html><head><title>Fixture Business {index} - Fake Maps</title>
+<link rel="stylesheet" href="/static/fixture.css">
+</head>
+<body>
+<div class="map"><img src="/maps/vt?pb=!1m4!1i15!2i{index}!3i0" alt=""></div>
+<div role="main">
+  <h1 class="DUwDvf">Fixture Business {index}</h1>
+  <img class="hero" src="/static/photos/{index}.jpg" alt="">
+  <div class="m6QErb" style="height: 600px; overflow-y: auto;">
+    <span class="MW4etd">{rating}</span>
+    <span class="UY7F9">({reviews})</span>
+    <button jsaction="pane.rating.category">Fixture Category {category}</button>
+    <button data-item-id="address"><div class="Io6YTe">{index} Fixture Street, Testville</div></button>
+    <a data-item-id="authority" href="{site}">fixture-business-{index}.com</a>
+    <button data-item-id="phone:tel:+1555{index:07d}"><div class="Io6YTe">+1 555 {index:07d}</div></button>
+    <div class="filler">{filler}</div>
+  </div>
+</div>
+<img src="/gen_204?atyp=i&ei={index}" width="1" height="1" alt="">
+</body></html>"""
+
+STYLESHEET = """@font-face { font-family: "Fixture Sans"; src: url("/static/fixture-sans.woff2") format("woff2"); }
+body { font-family: "Fixture Sans", sans-serif; }
+.map img { width: 256px; height: 256px; }
+"""
+
+# Resource kinds the fixture serves: (kind, content type, body size in bytes)
+ASSET_KINDS = {
+    "stylesheet": ("text/css", None),
+    "font": ("font/woff2", 24 * 1024),
+    "image": ("image/jpeg", 48 * 1024),
+    "tile": ("image/png", 16 * 1024),
+    "tracker": ("image/gif", 43),
+}
+
+
+def asset_kind(path):
+    """Kind of resource a request path asks for, or None for pages"""
+    if path == "/static/fixture.css":
+        return "stylesheet"
+    if path.endswith(".woff2"):
+        return "font"
+    if path.startswith("/static/photos/"):
+        return "image"
+    if path == "/maps/vt":
+        return "tile"
+    if path == "/gen_204":
+        return "tracker"
+    return None
+
+
+SITE_HOME = """<!DOCTYPE html>
+<html><head><title>Fixture Business {index}</title></head>
+<body>
+<nav><a href="/site/{index}/">Home</a> <a href="/site/{index}/contact">Contact us</a></nav>
+<main><h1>Welcome to Fixture Business {index}</h1><p>{filler}</p></main>
+</body></html>"""
+
+SITE_CONTACT = """<!DOCTYPE html>
+<html><head><title>Contact - Fixture Business {index}</title></head>
+<body>
+<main>
+  <h1>Contact</h1>
+  <p>Email: <a href="mailto:info@fixture-business-{index}.com">info@fixture-business-{index}.com</a></p>
+  <p>Sales: sales@fixture-business-{index}.com</p>
+  <p>Phone: (212) 555-{phone:04d}</p>
+  <p>{filler}</p>
+</main>
+</body></html>"""
+
+
+def payload_place(index, base_url):
+    """One result in the layout of the search payload: the place sits at index 14"""
+    place = [None] * 179
+    place[4] = [None] * 7 + [round(3 + index % 20 / 10, 1), 10 + index * 7 % 990]
+    place[7] = [f"{base_url}/site/{index}/", f"fixture-business-{index}.com"]
+    place[10] = f"0x{index:x}:0x{index:x}"
+    place[11] = f"Fixture Business {index}"
+    place[13] = [f"Fixture Category {index % 12}"]
+    place[39] = f"{index} Fixture Street, Testville"
+    place[178] = [[f"+1 555 {index:07d}"]]
+    result = [None] * 15
+    result[14] = place
+    return result
+
+
+def search_payload(query, indexes, base_url, envelope=True):
+    """Body of a search payload response for the given place indexes"""
+    payload = [[query, [[query, None, [len(indexes)]]] + [payload_place(index, base_url) for index in indexes]]]
+    body = ")]}'\n" + json.dumps(payload)
+    if envelope:
+        body = ")]}'\n" + json.dumps({"c": 0, "d": body})
+    return body
+
+
+class FakeMaps:
+    """Fixture content and request settings shared by the handler threads"""
+
+    def __init__(self, places=100, batch=10, latency_ms=0, page_kb=50):
+        self.places = places
+        self.batch = batch
+        self.latency = latency_ms / 1000.0
+        self.filler = html.escape(FILLER * max(1, page_kb * 1024 // len(FILLER)))
+        self.requests = 0
+        self.asset_requests = {}
+        self._lock = threading.Lock()
+
+    def asset(self, path):
+        """(content type, body bytes) for a resource request, counting it, or None for pages"""
+        kind = asset_kind(path)
+        if kind is None:
+            return None
+        with self._lock:
+            self.asset_requests[kind] = self.asset_requests.get(kind, 0) + 1
+        content_type, size = ASSET_KINDS[kind]
+        if kind == "stylesheet":
+            return content_type, STYLESHEET.encode("utf-8")
+        return content_type, b"\0" * size
+
+    def feed_items(self, offset):
+        items = [FEED_ITEM.format(index=index) for index in range(offset, min(offset + self.batch, self.places))]
+        if offset + self.batch >= self.places:
+            items.append(END_OF_LIST)
+        return "\n".join(items)
+
+    def render(self, path, query, base_url):
+        """(status, body) for a request path"""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts[:2] == ["maps", "search"]:
+            return 200, SEARCH_PAGE.format(
+                query=html.escape(parts[2] if len(parts) > 2 else ""), items=self.feed_items(0),
+                next_offset=self.batch, batch=self.batch, ended="true" if self.batch >= self.places else "false")
+        if parts[:1] == ["search"] and query.get("tbm") == ["map"]:
+            pb = query.get("pb", [""])[0]
+            offset = re.search(r'!8i(\d+)', pb)
+            size = re.search(r'!7i(\d+)', pb)
+            offset = int(offset.group(1)) if offset else 0
+            size = int(size.group(1)) if size else self.batch
+            return 200, search_payload(query.get("q", [""])[0],
+                                       range(offset, min(offset + size, self.places)), base_url)
+        if parts[:2] == ["maps", "feed"]:
+            return 200, self.feed_items(int(query.get("offset", ["0"])[0]))
+        if parts[:2] == ["maps", "place"] and len(parts) > 2:
+            index = int(parts[2].rsplit("+", 1)[-1])
+            return 200, PLACE_PAGE.format(
+                index=index, rating=f"{3 + index % 20 / 10:.1f}", reviews=10 + index * 7 % 990,
+                category=index % 12, site=f"{base_url}/site/{index}/", filler=self.filler)
+        if parts[:1] == ["site"] and len(parts) > 1:
+            index = int(parts[1])
+            if len(parts) > 2 and parts[2] == "contact":
+                return 200, SITE_CONTACT.format(index=index, phone=index % 10000, filler=self.filler)
+            return 200, SITE_HOME.format(index=index, filler=self.filler)
+        return 404, "<html><body>Not found</body></html>"
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with fake._lock:
+                fake.requests += 1
+            if fake.latency:
+                time.sleep(fake.latency)
+            url = urlsplit(self.path)
+            asset = fake.asset(url.path)
+            if asset is not None:
+                content_type, payload = asset
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            base_url = f"http://{self.headers.get('Host', '127.0.0.1')}"
+            try:
+                status, body = fake.render(url.path, parse_qs(url.query), base_url)
+            except ValueError:
+                status, body = 404, "<html><body>Not found</body></html>"
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            content_type = "application/json" if body.startswith(")]}'") else "text/html"
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(fake, host="127.0.0.1", port=0):
+    """Serve fake in a background thread; returns (server, maps base URL)"""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/maps"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Google Maps fixture server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--places", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=10, help="places added per feed scroll")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--page-kb", type=int, default=50)
+    args = parser.parse_args()
+
+    fake = FakeMaps(places=args.places, batch=args.batch, latency_ms=args.latency_ms, page_kb=args.page_kb)
+    server, base_url = start_server(fake, port=args.port)
+    print(f"Fake Maps serving {args.places} places at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""pytest-benchmark entry point for contact extraction over benchmarks/corpus
+
+    pip install -r requirements-dev.txt
+    pytest benchmarks/ --benchmark-only [--benchmark-compare]
+
+Each corpus page is timed with the current extractor and the legacy regex
+implementation (grouped per page so the two sit side by side). The current
+extractor must also find the page's labelled contacts; see bench_contacts for
+how the synthetic corpus is labelled.
+"""
+import pytest
+
+from bench_contacts import comparable, current_extract_contacts, legacy_extract_contacts, load_corpus
+
+PAGES = load_corpus()
+PAGE_IDS = [name[:-5] for name, page, expected in PAGES]
+
+
+@pytest.mark.parametrize("name,page,expected", PAGES, ids=PAGE_IDS)
+def test_current_extract_contacts(benchmark, name, page, expected):
+    benchmark.group = name
+    benchmark.extra_info["bytes"] = len(page.encode("utf-8"))
+    found = comparable(benchmark(current_extract_contacts, page))
+    assert found == expected
+
+
+@pytest.mark.parametrize("name,page,expected", PAGES, ids=PAGE_IDS)
+def test_legacy_extract_contacts(benchmark, name, page, expected):
+    benchmark.group = name
+    benchmark.extra_info["bytes"] = len(page.encode("utf-8"))
+    benchmark(legacy_extract_contacts, page)
@@ -0,0 +1,15 @@
+"""detail_parser selectors against the saved place pages (see check_detail_parser)"""
+import pytest
+
+from check_detail_parser import load_pages, wrong_fields
+
+PAGES = load_pages()
+
+
+def test_corpus_has_place_pages():
+    assert PAGES
+
+
+@pytest.mark.parametrize("page,html,expected", PAGES, ids=[page for page, html, expected in PAGES])
+def test_parse_business_page(page, html, expected):
+    assert wrong_fields(html, expected) == {}
@@ -0,0 +1,32 @@
+"""Results feed parser against the payload fixtures, and a direct harvest from the fake server (see bench_feed)"""
+import pytest
+
+from bench_feed import load_payloads, payload_matches
+from fake_maps import FakeMaps, start_server
+from feed_client import FeedClient, UnrecognizedPayload, parse_search_payload
+from scraper import canonical_place_id
+
+PAYLOADS = load_payloads()
+
+
+def test_payload_fixtures_present():
+    assert PAYLOADS
+
+
+@pytest.mark.parametrize("name,text,expected", PAYLOADS, ids=[name[:-4] for name, text, expected in PAYLOADS])
+def test_parse_search_payload(name, text, expected):
+    if expected.get("unrecognized"):
+        with pytest.raises(UnrecognizedPayload):
+            parse_search_payload(text)
+    else:
+        assert payload_matches(parse_search_payload(text), expected)
+
+
+def test_direct_harvest_from_fake_server():
+    fake = FakeMaps(places=45, batch=20)
+    server, base_url = start_server(fake)
+    try:
+        links = FeedClient().harvest(base_url, "fixture businesses", 45)
+    finally:
+        server.shutdown()
+    assert [canonical_place_id(link) for link in links] == [f"0x{index:x}:0x{index:x}" for index in range(45)]
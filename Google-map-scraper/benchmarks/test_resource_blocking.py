@@ -0,0 +1,81 @@
+"""Resource blocking profiles against the fake Maps fixture
+
+The pattern test runs anywhere: it checks which of the fixture's resources each
+profile's DevTools URL patterns cover. The browser test loads a fixture place
+page in headless Chrome under every profile and checks what actually reached
+the server, plus the ResourceBlocker counters; it is skipped without Chrome.
+
+    pytest benchmarks/test_resource_blocking.py
+"""
+import os
+import re
+import shutil
+
+import pytest
+
+from fake_maps import FakeMaps, start_server
+from resource_blocking import PROFILES, ResourceBlocker
+
+# One URL per resource kind the fixture serves, as a place page requests them
+FIXTURE_RESOURCES = {
+    "stylesheet": "/static/fixture.css",
+    "font": "/static/fixture-sans.woff2",
+    "image": "/static/photos/7.jpg",
+    "tile": "/maps/vt?pb=!1m4!1i15!2i7!3i0",
+    "tracker": "/gen_204?atyp=i&ei=7",
+}
+
+EXPECTED_BLOCKED = {
+    "none": set(),
+    "minimal": {"font", "image", "tile", "tracker"},
+    "text-only": {"stylesheet", "font", "image", "tile", "tracker"},
+}
+
+
+def blocked_by(patterns, url):
+    """Whether Network.setBlockedURLs patterns, where only * is special, match url"""
+    return any(re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) for pattern in patterns)
+
+
+def chrome_available():
+    return bool(os.environ.get("CHROME_BIN") or shutil.which("google-chrome") or shutil.which("chromium")
+                or shutil.which("chromium-browser"))
+
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_profile_patterns_cover_fixture_resources(profile):
+    blocked = {kind for kind, path in FIXTURE_RESOURCES.items()
+               if blocked_by(PROFILES[profile], "http://127.0.0.1:8765" + path)}
+    assert blocked == EXPECTED_BLOCKED[profile]
+
+
+@pytest.mark.skipif(not chrome_available(), reason="needs Chrome")
+def test_profiles_block_fixture_resources_in_chrome():
+    from driver_pool import create_driver, kill_driver
+
+    allowed_bytes = {}
+    for profile in ("none", "minimal", "text-only"):
+        fake = FakeMaps(places=10)
+        server, base_url = start_server(fake)
+        # A fresh browser per profile, so nothing is served from Chrome's cache
+        driver = create_driver()
+        try:
+            blocker = ResourceBlocker(enabled=profile != "none")
+            blocker.apply(driver, profile)
+            driver.get(f"{base_url}/place/Fixture+Business+7")
+            blocker.collect(driver)
+        finally:
+            kill_driver(driver)
+            server.shutdown()
+
+        stats = blocker.stats()
+        assert set(fake.asset_requests) == set(FIXTURE_RESOURCES) - EXPECTED_BLOCKED[profile], profile
+        if EXPECTED_BLOCKED[profile]:
+            # Under text-only the font is never requested, as its stylesheet is blocked first
+            assert stats["blocked_requests"] >= 4, profile
+            assert stats["blocked_by_type"], profile
+        else:
+            assert stats["blocked_requests"] == 0
+        allowed_bytes[profile] = stats["allowed_bytes"]
+
+    assert allowed_bytes["none"] > allowed_bytes["minimal"] > allowed_bytes["text-only"]
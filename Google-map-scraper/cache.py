@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+CACHE_MODES = ("use", "refresh", "bypass")
+
+
+def normalize_domain(url):
+    """Cache key for a website: lower-cased host without www. or port"""
+    if "//" not in url:
+        url = "http://" + url
+    host = urlsplit(url).hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+def website_cache_key(url):
+    """Cache key for a website: normalized host plus path
+
+    The path is part of the key because shared hosts (facebook.com/<page>,
+    sites.google.com/view/..., linktr.ee/<name>) serve many businesses.
+    """
+    if "//" not in url:
+        url = "http://" + url
+    path = urlsplit(url).path.rstrip("/")
+    return normalize_domain(url) + path
+
+
+class ResultCache:
+    """SQLite-backed cache of place details and website contacts with TTL and LRU eviction"""
+
+    def __init__(self, path="scraper_cache.db", ttl=7 * 24 * 3600, max_entries=50000, evict_every=100):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = {}
+        self.misses = {}
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed_at)")
+        self._conn.commit()
+
+    def _count(self, counters, namespace):
+        counters[namespace] = counters.get(namespace, 0) + 1
+
+    def get(self, namespace, key):
+        """Cached value, or None when missing or older than the TTL"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+                    self._conn.commit()
+                self._count(self.misses, namespace)
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key))
+            self._conn.commit()
+            self._count(self.hits, namespace)
+        return json.loads(row[0])
+
+    def set(self, namespace, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now, now))
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        self._conn.execute("DELETE FROM cache_entries WHERE created_at < ?", (time.time() - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN "
+                "(SELECT rowid FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,))
+
+    def stats(self):
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        return {
+            "entries": entries,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
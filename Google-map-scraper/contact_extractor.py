@@ -0,0 +1,110 @@
+import re
+from html import unescape
+from urllib.parse import unquote
+
+# Script/style bodies dominate Maps pages; only JSON-LD blocks carry contact data
+BLOCK_PATTERN = re.compile(r'<(script|style|noscript|svg|template)\b([^>]*)>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+STRUCTURED_DATA_PATTERN = re.compile(
+    r'<script\b[^>]*type\s*=\s*["\']?application/ld\+json[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+CONTACT_ATTRIBUTE_PATTERN = re.compile(r'(mailto|tel|callto):([^"\'<>\s]+)', re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+
+# One pass over the reduced text finds both kinds of contact
+CONTACT_PATTERN = re.compile(r"""
+    (?<![A-Za-z0-9._%+-])(?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,24})
+  | (?<![\w+/.-])(?P<phone>(?:\+|00)?\(?\d[\d \t.()\-/\u00a0]{5,22}\d)(?![\w/])
+""", re.VERBOSE)
+
+NON_DIGITS = re.compile(r'\D')
+DECIMAL_PATTERN = re.compile(r'\.\d{5,}|\d{5,}\.')
+WHITESPACE = re.compile(r'\s+')
+
+IGNORED_EMAIL_MARKERS = ('noreply', 'donotreply', 'no-reply')
+FILE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.css', '.js')
+
+
+def reduce_html(page):
+    """Cut a page down to visible text, contact attributes and structured data"""
+    if '<' not in page:
+        return page
+
+    parts = [match.group(0) for match in CONTACT_ATTRIBUTE_PATTERN.finditer(page)]
+    parts.extend(STRUCTURED_DATA_PATTERN.findall(page))
+
+    text = COMMENT_PATTERN.sub(' ', page)
+    text = BLOCK_PATTERN.sub('\n', text)
+    text = TAG_PATTERN.sub('\n', text)
+    parts.append(unescape(text))
+    return '\n'.join(parts)
+
+
+def normalize_email(email):
+    email = unquote(email).split('?')[0].strip().strip('.').lower()
+    if len(email) <= 5 or email.endswith(FILE_SUFFIXES):
+        return None
+    if any(marker in email for marker in IGNORED_EMAIL_MARKERS):
+        return None
+    return email
+
+
+def format_us_phone(digits):
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def normalize_phone(candidate, international=False):
+    """US numbers as (xxx) xxx-xxxx, other international numbers as +digits
+
+    National numbers with a leading trunk 0 (e.g. 030 1234567) are kept as written.
+    """
+    candidate = candidate.strip()
+    if candidate.count('(') != candidate.count(')') or '//' in candidate or DECIMAL_PATTERN.search(candidate):
+        return None
+    digits = NON_DIGITS.sub('', candidate)
+
+    if candidate.startswith('00'):
+        digits = digits[2:]
+        international = True
+    elif candidate.startswith('+'):
+        international = True
+
+    if international and not digits.startswith('0'):
+        if len(digits) == 11 and digits.startswith('1'):
+            return format_us_phone(digits[1:])
+        if 8 <= len(digits) <= 15:
+            return '+' + digits
+        if len(digits) == 10:
+            return format_us_phone(digits)
+        return None
+
+    if len(digits) == 10 and digits[0] not in '01':
+        return format_us_phone(digits)
+    if len(digits) == 11 and digits.startswith('1'):
+        return format_us_phone(digits[1:])
+    if digits.startswith('0') and 9 <= len(digits) <= 12 and '/' not in candidate.replace(' / ', ' '):
+        return WHITESPACE.sub(' ', candidate)
+    return None
+
+
+def extract_contacts(page, limit=3):
+    """Emails and phone numbers from raw HTML or plain text, deduplicated in page order"""
+    emails = {}
+    phones = {}
+
+    text = reduce_html(page)
+    for match in CONTACT_PATTERN.finditer(text):
+        if match.group('email'):
+            email = normalize_email(match.group('email'))
+            if email:
+                emails[email] = None
+        else:
+            start = match.start()
+            after_tel = text[max(0, start - 7):start].lower().endswith(('tel:', 'callto:'))
+            phone = normalize_phone(match.group('phone'), international=after_tel)
+            if phone:
+                phones[phone] = None
+
+    return {
+        'emails': list(emails)[:limit],
+        'phones': list(phones)[:limit]
+    }
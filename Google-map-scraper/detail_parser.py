@@ -0,0 +1,84 @@
+import re
+from lxml import etree, html
+
+# Bump SELECTOR_VERSION whenever Google's markup changes and a selector is updated,
+# so results can be traced back to the selector set that produced them.
+SELECTOR_VERSION = "2023.06"
+
+SELECTORS = {
+    'business_name': "//h1",
+    'address': "//button[@data-item-id='address']",
+    'rating': "//span[contains(concat(' ', normalize-space(@class), ' '), ' MW4etd ')]",
+    'review_count': "//span[contains(concat(' ', normalize-space(@class), ' '), ' UY7F9 ')]",
+    'category': "//button[contains(@jsaction, 'category')]",
+    'website': "//*[@data-item-id='authority']/@href",
+    'phone_item': "//button[starts-with(@data-item-id, 'phone:tel:')]/@data-item-id",
+    'phone_candidates': "//div[@class='rogA2c ']/div[@class='Io6YTe fontBodyMedium kR99db fdkmkc ']",
+}
+
+# Placeholder name when the h1 has no text; such records are never cached
+UNKNOWN_BUSINESS = "Unknown Business"
+
+COMPILED_SELECTORS = {field: etree.XPath(selector) for field, selector in SELECTORS.items()}
+
+# Icon glyphs from Google's private-use icon font end up in text_content()
+ICON_GLYPHS = re.compile(r'[\ue000-\uf8ff]')
+
+
+def is_phone_number(text):
+    cleaned = text.replace(" ", "").replace("-", "").replace("+", "")
+    return cleaned.isdigit() and len(cleaned) >= 6
+
+
+def _text(node):
+    return " ".join(ICON_GLYPHS.sub("", node.text_content()).split())
+
+
+def _first_text(tree, field):
+    for node in COMPILED_SELECTORS[field](tree):
+        text = _text(node)
+        if text:
+            return text
+    return None
+
+
+def _first_value(tree, field):
+    values = COMPILED_SELECTORS[field](tree)
+    return str(values[0]).strip() if values else None
+
+
+def parse_phone(tree):
+    for node in COMPILED_SELECTORS['phone_candidates'](tree):
+        text = _text(node)
+        if is_phone_number(text):
+            return text
+
+    item_id = _first_value(tree, 'phone_item')
+    if item_id:
+        return item_id[len('phone:tel:'):]
+    return None
+
+
+def parse_business_page(page_source):
+    """Parse every business field from one snapshot of a place page"""
+    tree = html.fromstring(page_source)
+    data = {}
+
+    data['business_name'] = _first_text(tree, 'business_name') or UNKNOWN_BUSINESS
+    data['address'] = _first_text(tree, 'address') or "Address not found"
+
+    try:
+        data['rating'] = float(_first_text(tree, 'rating').replace(',', '.'))
+    except (AttributeError, ValueError):
+        data['rating'] = None
+
+    try:
+        data['review_count'] = int(re.sub(r'[^\d]', '', _first_text(tree, 'review_count')))
+    except (TypeError, ValueError):
+        data['review_count'] = None
+
+    data['category'] = _first_text(tree, 'category') or "Unknown Category"
+    data['website'] = _first_value(tree, 'website')
+    data['phone_no'] = parse_phone(tree)
+    data['selector_version'] = SELECTOR_VERSION
+    return data
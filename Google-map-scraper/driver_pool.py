@@ -0,0 +1,326 @@
+import os
+import queue
+import signal
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """Resolve the chromedriver binary once per process"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            if os.environ.get("CHROMEDRIVER_PATH"):
+                _driver_path = os.environ["CHROMEDRIVER_PATH"]
+            else:
+                from webdriver_manager.chrome import ChromeDriverManager
+                _driver_path = ChromeDriverManager().install()
+            print(f"✓ Using chromedriver at {_driver_path}")
+        return _driver_path
+
+
+def build_chrome_options():
+    """Chrome options shared by every scraper driver"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # Network events feed the per-run byte counts in resource_blocking
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    # Set Chrome binary location if specified in environment
+    if os.environ.get("CHROME_BIN"):
+        chrome_options.binary_location = os.environ["CHROME_BIN"]
+
+    return chrome_options
+
+
+def create_driver():
+    """Launch a new headless Chrome driver"""
+    driver = webdriver.Chrome(
+        service=Service(resolve_driver_path()),
+        options=build_chrome_options()
+    )
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+def _child_pids(pid):
+    """Direct children of a process, read from /proc"""
+    children = []
+    try:
+        task_dir = f"/proc/{pid}/task"
+        for tid in os.listdir(task_dir):
+            with open(f"{task_dir}/{tid}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except (OSError, ValueError):
+        pass
+    return children
+
+
+def _process_rss(pid):
+    """Resident set size of a single process in bytes"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def process_cpu_seconds(pid):
+    """User plus system CPU time of a single process in seconds"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces; fields resume after its closing parenthesis
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def process_tree_pids(pid):
+    """A process and all its descendants"""
+    pending = [pid]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        yield current
+        pending.extend(_child_pids(current))
+
+
+def process_tree_rss(pid):
+    """Total RSS in bytes of a process and all its descendants"""
+    return sum(_process_rss(current) for current in process_tree_pids(pid))
+
+
+def process_tree_cpu(pid):
+    """CPU seconds used so far by a process and its live descendants"""
+    return sum(process_cpu_seconds(current) for current in process_tree_pids(pid))
+
+
+def driver_rss(driver):
+    """RSS in bytes of chromedriver plus the Chrome processes it spawned"""
+    try:
+        return process_tree_rss(driver.service.process.pid)
+    except Exception:
+        return 0
+
+
+def kill_driver(driver):
+    """Quit a driver, killing chromedriver and Chrome outright if it no longer responds"""
+    try:
+        pids = list(process_tree_pids(driver.service.process.pid))
+    except Exception:
+        pids = []
+    quitter = threading.Thread(target=_quit_quietly, args=(driver,), daemon=True)
+    quitter.start()
+    quitter.join(10)
+    if not quitter.is_alive():
+        return
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Driver quit error: {e}")
+
+
+def driver_cpu(driver):
+    """CPU seconds used by chromedriver plus the Chrome processes it spawned"""
+    try:
+        return process_tree_cpu(driver.service.process.pid)
+    except Exception:
+        return 0.0
+
+
+class DriverPool:
+    """Pool of pre-launched Chrome drivers shared across scrape requests"""
+
+    def __init__(self, size=2, max_pages=200, max_rss_mb=1500, checkout_timeout=120):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.checkout_timeout = checkout_timeout
+        self._idle = queue.Queue()
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.checked_out = 0
+        self.recycled = 0
+
+    def start(self):
+        """Launch the initial set of drivers"""
+        resolve_driver_path()
+        for _ in range(self.size):
+            try:
+                self._idle.put(self._launch())
+            except Exception as e:
+                print(f"Driver pool launch error: {e}")
+        print(f"✓ Driver pool ready ({self._idle.qsize()}/{self.size} drivers)")
+
+    def _launch(self):
+        driver = create_driver()
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Driver quit error: {e}")
+
+    def _replace(self, driver):
+        self._discard(driver)
+        self.recycled += 1
+        return self._launch()
+
+    def replace(self, driver):
+        """Swap a checked-out driver that went bad for a fresh one in the same slot"""
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        kill_driver(driver)
+        self.recycled += 1
+        return self._launch()
+
+    def is_healthy(self, driver):
+        """Cheap liveness probe against the driver session"""
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def checkout(self, timeout=None):
+        """Take a healthy driver from the pool, waiting up to timeout seconds"""
+        if self._closed:
+            raise RuntimeError("Driver pool is shut down")
+        try:
+            driver = self._idle.get(timeout=self.checkout_timeout if timeout is None else timeout)
+        except queue.Empty:
+            raise TimeoutError("No browser driver available")
+
+        try:
+            if not self.is_healthy(driver):
+                print("Replacing unhealthy driver")
+                driver = self._replace(driver)
+        except Exception:
+            # Launch failed; give the slot back so the pool does not shrink
+            self._idle.put(driver)
+            raise
+
+        with self._lock:
+            self.checked_out += 1
+        return driver
+
+    def try_checkout(self, timeout=0):
+        """Take a driver if one is idle now or frees up within timeout seconds, else None"""
+        try:
+            return self.checkout(timeout=timeout)
+        except TimeoutError:
+            return None
+
+    def checkin(self, driver, pages_loaded=0):
+        """Return a driver, resetting or recycling it as needed"""
+        with self._lock:
+            self.checked_out -= 1
+            pages = self._pages.get(id(driver), 0) + pages_loaded
+            self._pages[id(driver)] = pages
+
+        if self._closed:
+            self._discard(driver)
+            return
+
+        try:
+            if (not self.is_healthy(driver)
+                    or pages >= self.max_pages
+                    or driver_rss(driver) >= self.max_rss_bytes):
+                driver = self._replace(driver)
+            else:
+                self.reset(driver)
+        except Exception as e:
+            print(f"Driver reset error: {e}")
+            try:
+                driver = self._replace(driver)
+            except Exception as launch_error:
+                # Keep the slot: checkout sees the dead driver and retries the launch
+                print(f"Driver relaunch error: {launch_error}")
+
+        self._idle.put(driver)
+
+    def reset(self, driver):
+        """Clear per-job browser state: extra tabs, cookies of every domain and the storage of open tabs
+
+        Storage (local storage, IndexedDB, service workers, cache) is cleared for the
+        origin of each tab still open; origins of tabs closed during the job keep theirs.
+        """
+        handles = driver.window_handles
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            self._clear_storage(driver)
+            if handle != handles[0]:
+                driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+        try:
+            driver.get_log("performance")
+        except Exception:
+            pass
+
+    def _clear_storage(self, driver):
+        origin = driver.execute_script("return window.location.origin")
+        if origin and origin.startswith("http"):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Check out a driver for the duration of a with-block"""
+        driver = self.checkout(timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "checked_out": self.checked_out,
+            "recycled": self.recycled,
+        }
+
+    def shutdown(self):
+        """Quit every idle driver; checked-out drivers are quit on checkin"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
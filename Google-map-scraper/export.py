@@ -0,0 +1,91 @@
+import csv
+from records import EXPORT_SCHEMA
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+class CSVExporter:
+    """Write records to a CSV file, flushing every chunk_size rows"""
+
+    def __init__(self, path, chunk_size=500):
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._rows = []
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, kind in EXPORT_SCHEMA])
+
+    def write(self, record):
+        self._rows.append(record.export_row())
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        self._writer.writerows(self._rows)
+        self._file.flush()
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class ParquetExporter:
+    """Write records to a Parquet file, one row group per chunk_size rows"""
+
+    def __init__(self, path, chunk_size=500):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+        self.pa = pyarrow
+        types = {str: pyarrow.string(), float: pyarrow.float64(), int: pyarrow.int64(),
+                 dict: pyarrow.string(), list: pyarrow.string()}
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in EXPORT_SCHEMA])
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._rows = []
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, record):
+        self._rows.append(record.export_row())
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        columns = [self.pa.array(column, type=field.type)
+                   for column, field in zip(zip(*self._rows), self.schema)]
+        self._writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+def open_exporter(export_format, path, chunk_size=500):
+    if export_format == "csv":
+        return CSVExporter(path, chunk_size=chunk_size)
+    if export_format == "parquet":
+        return ParquetExporter(path, chunk_size=chunk_size)
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+
+def export_records(records, export_format, path, chunk_size=500):
+    """Write an iterable of BusinessRecord to path; returns the row count"""
+    exporter = open_exporter(export_format, path, chunk_size=chunk_size)
+    try:
+        for record in records:
+            exporter.write(record)
+    finally:
+        exporter.close()
+    return exporter.rows_written
@@ -0,0 +1,151 @@
+import html
+import json
+import re
+import threading
+from urllib.parse import urljoin, urlsplit, quote_plus
+import requests
+from requests.adapters import HTTPAdapter
+from website_crawler import USER_AGENT
+
+# The search page preloads the first page of the results feed from this endpoint
+PRELOAD_PATTERN = re.compile(r'<link[^>]+href="([^"]*/search\?tbm=map[^"]*)"', re.IGNORECASE)
+OFFSET_PATTERN = re.compile(r'!8i\d+')
+PAGE_SIZE_PATTERN = re.compile(r'!7i(\d+)')
+XSSI_PREFIX = ")]}'"
+FEATURE_ID_PATTERN = re.compile(r'^0x[0-9a-f]+:0x[0-9a-f]+$', re.IGNORECASE)
+
+# Where things live in the feed payload: payload[0][1] lists the results, and
+# each result keeps its place under index 14. Update together with SELECTOR_VERSION
+# in detail_parser when Google reshapes the payload.
+RESULTS_PATH = (0, 1)
+PLACE_INDEX = 14
+PLACE_FIELDS = {
+    'feature_id': (10,),
+    'business_name': (11,),
+    'address': (39,),
+    'rating': (4, 7),
+    'review_count': (4, 8),
+    'website': (7, 0),
+    'category': (13, 0),
+    'phone_no': (178, 0, 0),
+}
+
+
+class UnrecognizedPayload(Exception):
+    """The feed response does not have the shape this parser knows"""
+
+
+def _dig(value, path):
+    for key in path:
+        if not isinstance(value, list) or key >= len(value):
+            return None
+        value = value[key]
+    return value
+
+
+def strip_xssi(text):
+    text = text.lstrip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    return text
+
+
+def decode_payload(text):
+    """JSON of a feed response, unwrapping the {"d": ")]}'..."} envelope when present"""
+    try:
+        payload = json.loads(strip_xssi(text))
+        if isinstance(payload, dict) and isinstance(payload.get('d'), str):
+            payload = json.loads(strip_xssi(payload['d']))
+    except ValueError as e:
+        raise UnrecognizedPayload(f"Feed response is not JSON: {e}")
+    if not isinstance(payload, list):
+        raise UnrecognizedPayload("Feed response is not a list")
+    return payload
+
+
+def parse_search_payload(text):
+    """Place entries of one page of the results feed, in feed order"""
+    results = _dig(decode_payload(text), RESULTS_PATH)
+    if not isinstance(results, list):
+        raise UnrecognizedPayload("No results list in feed response")
+
+    entries = []
+    for result in results:
+        place = _dig(result, (PLACE_INDEX,))
+        if not isinstance(place, list):
+            # The first item describes the search itself
+            continue
+        entry = {field: _dig(place, path) for field, path in PLACE_FIELDS.items()}
+        if not (isinstance(entry['feature_id'], str) and FEATURE_ID_PATTERN.match(entry['feature_id'])
+                and isinstance(entry['business_name'], str)):
+            raise UnrecognizedPayload("Place entry without feature id and name")
+        entries.append(entry)
+    return entries
+
+
+def place_url(maps_base_url, entry):
+    """A /maps/place/ link that canonical_place_id resolves to the entry's feature id"""
+    return (f"{maps_base_url}/place/{quote_plus(entry['business_name'])}"
+            f"/data=!4m2!3m1!1s{entry['feature_id']}")
+
+
+class FeedClient:
+    """Harvest place links by replaying the results feed requests over plain HTTP"""
+
+    def __init__(self, timeout=(3.05, 10), pool_size=8):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        # Consent walls and captcha pages redirect away from the requested host
+        if response.status_code != 200 or urlsplit(response.url).netloc != urlsplit(url).netloc:
+            raise UnrecognizedPayload(f"Feed request answered {response.status_code} from {response.url}")
+        return response.text
+
+    def feed_url(self, maps_base_url, search_query):
+        """URL of the first feed page, taken from the search page's preload link"""
+        search_url = f"{maps_base_url}/search/{search_query.replace(' ', '+')}"
+        match = PRELOAD_PATTERN.search(self.get(search_url))
+        if match is None:
+            raise UnrecognizedPayload("Search page has no results feed preload")
+        return urljoin(search_url, html.unescape(match.group(1)))
+
+    def harvest(self, maps_base_url, search_query, max_results, should_stop=None):
+        """Up to max_results place links, or raise UnrecognizedPayload"""
+        feed_url = self.feed_url(maps_base_url, search_query)
+        page_size = PAGE_SIZE_PATTERN.search(feed_url)
+        page_size = int(page_size.group(1)) if page_size else None
+
+        links = []
+        offset = 0
+        while len(links) < max_results and not (should_stop and should_stop()):
+            url = feed_url if offset == 0 else OFFSET_PATTERN.sub(f"!8i{offset}", feed_url)
+            entries = parse_search_payload(self.get(url))
+            links.extend(place_url(maps_base_url, entry) for entry in entries)
+            if not entries or page_size is None or len(entries) < page_size:
+                break
+            if not OFFSET_PATTERN.search(feed_url):
+                raise UnrecognizedPayload("Feed URL has no offset parameter")
+            offset += page_size
+        return links[:max_results]
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def shared_feed_client():
+    """Process-wide feed client so every scraper shares one connection pool"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = FeedClient()
+        return _shared_client
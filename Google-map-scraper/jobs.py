@@ -0,0 +1,127 @@
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue cannot admit more work"""
+
+
+class JobConflict(Exception):
+    """Raised when a job id is already queued or running"""
+
+
+class Job:
+    """A scrape job tracked by the JobManager"""
+
+    def __init__(self, job_id, params):
+        self.job_id = job_id
+        self.params = params
+        self.status = "queued"
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.scraper = None
+        self.results = []
+        self.future = None
+        self.cancel_event = threading.Event()
+
+    def progress(self):
+        scraper = self.scraper
+        return {
+            "links_found": getattr(scraper, "links_found", 0),
+            "businesses_extracted": getattr(scraper, "extracted_count", 0),
+            "pacing": scraper.pacer.stats() if scraper is not None else None,
+            "network": scraper.resource_blocker.stats() if scraper is not None else None,
+            "driver": scraper.watchdog.stats() if scraper is not None else None,
+        }
+
+    def partial_results(self):
+        """Results so far: the final list once done, the live scraper list while running"""
+        if self.status == "completed":
+            return list(self.results)
+        if self.scraper is not None:
+            return list(self.scraper.results)
+        return []
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "progress": self.progress(),
+        }
+
+
+class JobManager:
+    """Runs scrape jobs on a bounded executor with a bounded backlog"""
+
+    def __init__(self, max_concurrency=2, max_queue=10, max_finished=200):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="scrape-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def submit(self, run, params, job_id=None):
+        """Queue run(job) and return the Job, or raise JobQueueFull"""
+        with self._lock:
+            if self._active >= self.max_concurrency + self.max_queue:
+                raise JobQueueFull(
+                    f"{self._active} jobs already queued or running (limit {self.max_concurrency + self.max_queue})")
+            existing = self._jobs.get(job_id) if job_id else None
+            if existing is not None and existing.finished_at is None:
+                raise JobConflict(f"Job {job_id} is already {existing.status}")
+            job = Job(job_id or uuid.uuid4().hex, params)
+            self._jobs[job.job_id] = job
+            self._active += 1
+            self._evict_finished()
+
+        job.future = self._executor.submit(self._run, run, job)
+        return job
+
+    def _run(self, run, job):
+        job.status = "running"
+        job.started_at = datetime.now()
+        try:
+            job.results = run(job)
+            job.status = "completed"
+            return job.results
+        except Exception as e:
+            print(f"Job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+            raise
+        finally:
+            job.finished_at = datetime.now()
+            with self._lock:
+                self._active -= 1
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "running": running,
+                "queued": self._active - running,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,151 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class JobJournal:
+    """Durable SQLite record of each job's harvested links and finished places
+
+    A job restarted with the same id reuses its links, skips finished places and
+    retries failed ones until they run out of attempts. Entries are kept until
+    prune() drops them.
+    """
+
+    def __init__(self, path="scraper_jobs.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS journal_jobs (
+                job_id TEXT PRIMARY KEY,
+                search_query TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                links_harvested INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS journal_places (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                record TEXT,
+                error TEXT,
+                PRIMARY KEY (job_id, idx)
+            );
+        """)
+        self._conn.commit()
+
+    def _write(self, sql, args=()):
+        with self._lock:
+            self._conn.execute(sql, args)
+            self._conn.commit()
+
+    def _read(self, sql, args=()):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def start_job(self, job_id, search_query, params):
+        """Register a job, keeping the existing entry when resuming"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO journal_jobs (job_id, search_query, params, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'running', ?, ?)",
+                (job_id, search_query, json.dumps(params), now, now))
+            self._conn.execute(
+                "UPDATE journal_jobs SET status = 'running', updated_at = ? WHERE job_id = ?", (now, job_id))
+            self._conn.commit()
+
+    def prune(self, older_than, keep_running=True):
+        """Forget jobs last updated before older_than, with their places; returns how many"""
+        status_clause = " AND status != 'running'" if keep_running else ""
+        with self._lock:
+            job_ids = [job_id for (job_id,) in self._conn.execute(
+                "SELECT job_id FROM journal_jobs WHERE updated_at < ?" + status_clause, (older_than,))]
+            self._conn.executemany("DELETE FROM journal_places WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            self._conn.executemany("DELETE FROM journal_jobs WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            self._conn.commit()
+        return len(job_ids)
+
+    def finish_job(self, job_id, status):
+        self._write("UPDATE journal_jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+                    (status, time.time(), job_id))
+
+    def job(self, job_id):
+        rows = self._read(
+            "SELECT search_query, params, status, links_harvested, created_at, updated_at "
+            "FROM journal_jobs WHERE job_id = ?", (job_id,))
+        if not rows:
+            return None
+        search_query, params, status, links_harvested, created_at, updated_at = rows[0]
+        return {
+            "job_id": job_id,
+            "search_query": search_query,
+            "params": json.loads(params),
+            "status": status,
+            "links_harvested": bool(links_harvested),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def save_links(self, job_id, links):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO journal_places (job_id, idx, url) VALUES (?, ?, ?)",
+                [(job_id, index, url) for index, url in enumerate(links)])
+            self._conn.execute(
+                "UPDATE journal_jobs SET links_harvested = 1, updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+            self._conn.commit()
+
+    def links(self, job_id):
+        """Harvested links in feed order, or None if harvesting never finished"""
+        job = self.job(job_id)
+        if job is None or not job["links_harvested"]:
+            return None
+        rows = self._read("SELECT url FROM journal_places WHERE job_id = ? ORDER BY idx", (job_id,))
+        return [url for (url,) in rows]
+
+    def completed(self, job_id):
+        return list(self.iter_completed(job_id))
+
+    def iter_completed(self, job_id, page_size=500):
+        """(index, record) of finished places in feed order, read page by page"""
+        after = -1
+        while True:
+            rows = self._read(
+                "SELECT idx, record FROM journal_places WHERE job_id = ? AND status = 'done' AND idx > ? "
+                "ORDER BY idx LIMIT ?", (job_id, after, page_size))
+            for index, record in rows:
+                yield index, json.loads(record)
+            if len(rows) < page_size:
+                return
+            after = rows[-1][0]
+
+    def attempts(self, job_id):
+        rows = self._read("SELECT idx, attempts FROM journal_places WHERE job_id = ?", (job_id,))
+        return dict(rows)
+
+    def record_done(self, job_id, index, record):
+        self._write(
+            "UPDATE journal_places SET status = 'done', attempts = attempts + 1, record = ?, error = NULL "
+            "WHERE job_id = ? AND idx = ?",
+            (json.dumps(record), job_id, index))
+
+    def record_failure(self, job_id, index, error):
+        self._write(
+            "UPDATE journal_places SET status = 'failed', attempts = attempts + 1, error = ? "
+            "WHERE job_id = ? AND idx = ?",
+            (error, job_id, index))
+
+    def counts(self, job_id):
+        rows = self._read("SELECT status, COUNT(*) FROM journal_places WHERE job_id = ? GROUP BY status", (job_id,))
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
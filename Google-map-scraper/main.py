@@ -1,21 +1,117 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
+from fastapi.responses import StreamingResponse, Response, FileResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Literal
 import json
 from datetime import datetime
 import os
+import asyncio
+import time
+import tempfile
 from scraper import AdvancedContactExtractor
+from batch import BatchScraper
+from driver_pool import DriverPool, resolve_driver_path
+from jobs import JobManager, JobQueueFull, JobConflict
+from journal import JobJournal
+from workqueue import open_work_queue
+from records import BusinessRecord
+from export import EXPORT_FORMATS, export_records
+from pacing import Pacer
+from cache import ResultCache
+from resource_blocking import ResourceBlocker
+from watchdog import DriverWatchdog
+from metrics import PhaseTimer, LINKS_FOUND, DRIVER_POOL_DRIVERS, JOBS
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 
 app = FastAPI(title="Google Maps Business Scraper API")
 
+JOB_CONCURRENCY = int(os.environ.get("JOB_CONCURRENCY", "2"))
+MAX_DETAIL_WORKERS = int(os.environ.get("MAX_DETAIL_WORKERS", "4"))
+
+# By default every running job can fill all its detail workers with warm drivers
+driver_pool = DriverPool(
+    size=int(os.environ.get("DRIVER_POOL_SIZE", str(JOB_CONCURRENCY * MAX_DETAIL_WORKERS))),
+    max_pages=int(os.environ.get("DRIVER_MAX_PAGES", "200")),
+    max_rss_mb=int(os.environ.get("DRIVER_MAX_RSS_MB", "1500")),
+)
+
+result_cache = ResultCache(
+    path=os.environ.get("CACHE_PATH", "scraper_cache.db"),
+    ttl=float(os.environ.get("CACHE_TTL_HOURS", "168")) * 3600,
+    max_entries=int(os.environ.get("CACHE_MAX_ENTRIES", "50000")),
+)
+
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("STREAM_HEARTBEAT_SECONDS", "15"))
+
+journal = JobJournal(os.environ.get("JOURNAL_PATH", "scraper_jobs.db"))
+JOURNAL_RETENTION_HOURS = float(os.environ.get("JOURNAL_RETENTION_HOURS", "168"))
+PLACE_MAX_ATTEMPTS = int(os.environ.get("PLACE_MAX_ATTEMPTS", "3"))
+
+MAX_BATCH_QUERIES = int(os.environ.get("MAX_BATCH_QUERIES", "500"))
+
+work_queue = open_work_queue(os.environ.get("WORK_QUEUE_URL", "sqlite:///scraper_queue.db"),
+                             max_attempts=PLACE_MAX_ATTEMPTS)
+WORK_POLL_SECONDS = float(os.environ.get("WORK_POLL_SECONDS", "2"))
+WORK_NO_PROGRESS_SECONDS = float(os.environ.get("WORK_NO_PROGRESS_SECONDS", "600"))
+
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "500"))
+
+DRIVER_PAGE_LOAD_TIMEOUT = float(os.environ.get("DRIVER_PAGE_LOAD_TIMEOUT", "30"))
+DRIVER_SCRIPT_TIMEOUT = float(os.environ.get("DRIVER_SCRIPT_TIMEOUT", "15"))
+DRIVER_MAX_WINDOWS = int(os.environ.get("DRIVER_MAX_WINDOWS", "3"))
+DRIVER_PLACE_TIMEOUT = float(os.environ.get("DRIVER_PLACE_TIMEOUT", "180"))
+
+job_manager = JobManager(
+    max_concurrency=JOB_CONCURRENCY,
+    max_queue=int(os.environ.get("JOB_QUEUE_DEPTH", "10")),
+)
+
+def delays_in_order(max_delay, values):
+    if "min_delay" in values and max_delay < values["min_delay"]:
+        raise ValueError("max_delay must not be below min_delay")
+    return max_delay
+
 class SearchRequest(BaseModel):
     search_query: str
     max_results: Optional[int] = 20
     visit_websites: Optional[bool] = True
+    detail_workers: Optional[int] = 1
+    min_delay: float = Field(0.5, ge=0)
+    max_delay: float = Field(20.0, ge=0)
+    cache_mode: Literal["use", "refresh", "bypass"] = "use"
+    block_resources: Optional[bool] = True
+    include_timings: Optional[bool] = False
+    harvest_mode: Literal["browser", "direct"] = "browser"
+    distributed: Optional[bool] = False
+    job_id: Optional[str] = None
+
+    _delays_in_order = validator("max_delay", allow_reuse=True)(delays_in_order)
+
+class BatchQuery(BaseModel):
+    search_query: str
+    max_results: Optional[int] = 20
+
+    class Config:
+        # Other settings are batch-wide; reject them here rather than ignore them
+        extra = "forbid"
+
+class BatchRequest(BaseModel):
+    queries: List[BatchQuery]
+    visit_websites: Optional[bool] = True
+    detail_workers: Optional[int] = 1
+    min_delay: float = Field(0.5, ge=0)
+    max_delay: float = Field(20.0, ge=0)
+    cache_mode: Literal["use", "refresh", "bypass"] = "use"
+    block_resources: Optional[bool] = True
+    include_timings: Optional[bool] = False
+    harvest_mode: Literal["browser", "direct"] = "browser"
+    job_id: Optional[str] = None
+
+    _delays_in_order = validator("max_delay", allow_reuse=True)(delays_in_order)
 
 class BusinessData(BaseModel):
     business_name: str
@@ -29,12 +125,44 @@ class BusinessData(BaseModel):
     secondary_email: Optional[str]
     additional_contacts: Optional[dict]
 
+def prune_journal(keep_running=True):
+    if JOURNAL_RETENTION_HOURS > 0:
+        pruned = journal.prune(time.time() - JOURNAL_RETENTION_HOURS * 3600, keep_running=keep_running)
+        if pruned:
+            print(f"Pruned {pruned} jobs from the journal")
+
+@app.on_event("startup")
+def start_driver_pool():
+    # Nothing is running yet, so jobs a crash left marked running can go too
+    prune_journal(keep_running=False)
+    driver_pool.start()
+
+@app.on_event("shutdown")
+def stop_driver_pool():
+    job_manager.shutdown()
+    driver_pool.shutdown()
+    result_cache.close()
+    journal.close()
+    work_queue.close()
+
+for state in ("idle", "checked_out"):
+    DRIVER_POOL_DRIVERS.labels(state).set_function(lambda state=state: driver_pool.stats()[state])
+for status in ("running", "queued"):
+    JOBS.labels(status).set_function(lambda status=status: job_manager.stats()[status])
+
+@app.get("/metrics")
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/")
 async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "service": "Google Maps Scraper API"
+        "service": "Google Maps Scraper API",
+        "driver_pool": driver_pool.stats(),
+        "jobs": job_manager.stats(),
+        "cache": result_cache.stats()
     }
 
 def get_chrome_options():
@@ -54,7 +182,7 @@ def get_chrome_options():
 async def test_chrome():
     try:
         chrome_options = get_chrome_options()
-        service = Service(ChromeDriverManager().install())
+        service = Service(resolve_driver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
 
         driver.get("https://www.google.com")
@@ -69,45 +197,357 @@ async def test_chrome():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chrome test failed: {str(e)}")
 
+def format_business(business_data):
+    formatted_data = {field: getattr(business_data, field) for field in BusinessData.__fields__}
+    if business_data.matched_queries is not None:
+        formatted_data["matched_queries"] = business_data.matched_queries
+    return formatted_data
+
+def build_extractor(job, request, driver, search_query, max_results, **kwargs):
+    """Extractor wired to the shared pool, cache and per-job instrumentation"""
+    return AdvancedContactExtractor(
+        search_query=search_query,
+        max_results=max_results,
+        visit_websites=request.visit_websites,
+        driver=driver,
+        detail_workers=min(request.detail_workers or 1, MAX_DETAIL_WORKERS),
+        driver_pool=driver_pool,
+        pacer=Pacer(min_delay=request.min_delay, max_delay=request.max_delay),
+        cache=result_cache,
+        cache_mode=request.cache_mode,
+        cancel_event=job.cancel_event,
+        resource_blocker=ResourceBlocker(enabled=request.block_resources),
+        timer=PhaseTimer(),
+        max_attempts=PLACE_MAX_ATTEMPTS,
+        harvest_mode=request.harvest_mode,
+        watchdog=DriverWatchdog(
+            page_load_timeout=DRIVER_PAGE_LOAD_TIMEOUT,
+            script_timeout=DRIVER_SCRIPT_TIMEOUT,
+            max_rss_mb=driver_pool.max_rss_bytes // (1024 * 1024),
+            max_windows=DRIVER_MAX_WINDOWS,
+            place_timeout=DRIVER_PLACE_TIMEOUT,
+        ),
+        **kwargs
+    )
+
+def release_driver(job, driver):
+    """Check in the job's current driver, which the watchdog may have swapped mid-run"""
+    if job.scraper is None:
+        driver_pool.checkin(driver)
+    else:
+        driver_pool.checkin(job.scraper.driver, job.scraper.pages_loaded)
+
+def run_scrape_job(job, on_record=None):
+    """Run one scrape on a pooled driver; executes on a job worker thread"""
+    request = job.params
+    # Journaled only once a driver is in hand, so a checkout timeout leaves no running entry
+    driver = driver_pool.checkout()
+    try:
+        journal.start_job(job.job_id, request.search_query, request.dict())
+        job.scraper = build_extractor(job, request, driver, request.search_query, request.max_results,
+                                      journal=journal, job_id=job.job_id)
+        return job.scraper.run_extraction(on_record=on_record)
+    finally:
+        release_driver(job, driver)
+        entry = journal.job(job.job_id)
+        if entry is not None:
+            counts = journal.counts(job.job_id)
+            if job.cancel_event.is_set():
+                journal.finish_job(job.job_id, "cancelled")
+            elif counts.get("failed") or counts.get("pending") or not entry["links_harvested"]:
+                journal.finish_job(job.job_id, "incomplete")
+            else:
+                journal.finish_job(job.job_id, "completed")
+        prune_journal()
+
+def run_batch_job(job):
+    """Run a multi-query batch on a pooled driver plus extra workers"""
+    request = job.params
+    driver = driver_pool.checkout()
+    try:
+        job.scraper = build_extractor(job, request, driver, request.queries[0].search_query,
+                                      request.queries[0].max_results)
+        queries = [(query.search_query, query.max_results) for query in request.queries]
+        return BatchScraper(queries, job.scraper).run()
+    finally:
+        release_driver(job, driver)
+
+def work_queue_job_id(job):
+    # Ids may be reused across runs; keep each run's tasks apart
+    return f"{job.job_id}:{job.created_at.timestamp()}"
+
+def run_distributed_job(job, on_record=None):
+    """Harvest links here and leave place extraction to `python -m worker` processes"""
+    request = job.params
+    driver = driver_pool.checkout()
+    try:
+        job.scraper = build_extractor(job, request, driver, request.search_query, request.max_results)
+        scraper = job.scraper
+        business_links = scraper.harvest_links()
+        if business_links is None:
+            return []
+    finally:
+        release_driver(job, driver)
+
+    scraper.links_found = len(business_links)
+    LINKS_FOUND.inc(len(business_links))
+    queue_job_id = work_queue_job_id(job)
+    work_queue.enqueue(queue_job_id, [{
+        "url": link,
+        "search_query": request.search_query,
+        "visit_websites": request.visit_websites,
+        "cache_mode": request.cache_mode,
+        "block_resources": request.block_resources,
+    } for link in business_links])
+    print(f"Queued {len(business_links)} places for workers")
+
+    indexed = []
+    cursor = 0
+    last_counts = None
+    last_activity = work_queue.last_activity()
+    last_progress = time.monotonic()
+    while True:
+        if job.cancel_event.is_set():
+            work_queue.cancel(queue_job_id)
+            break
+        # Counted before fetching so no result lands between the two
+        counts = work_queue.counts(queue_job_id)
+        # Workers busy with other jobs' tasks ahead of ours count as progress too
+        activity = work_queue.last_activity()
+        if counts != last_counts or activity != last_activity:
+            last_counts = counts
+            last_activity = activity
+            last_progress = time.monotonic()
+        for cursor, index, result in work_queue.results(queue_job_id, after=cursor):
+            business_data = BusinessRecord.from_dict(result)
+            scraper.extracted_count += 1
+            if on_record is not None:
+                on_record(index, business_data)
+            else:
+                indexed.append((index, business_data))
+                scraper.results.append(business_data)
+        if not counts.get("queued") and not counts.get("leased"):
+            break
+        if WORK_NO_PROGRESS_SECONDS > 0 and time.monotonic() - last_progress > WORK_NO_PROGRESS_SECONDS:
+            # No worker is picking tasks up; stop instead of polling forever
+            work_queue.cancel(queue_job_id)
+            raise RuntimeError(
+                f"No worker activity for {WORK_NO_PROGRESS_SECONDS:.0f}s with {counts.get('queued', 0)} places "
+                f"queued and {counts.get('leased', 0)} leased; is `python -m worker` running?")
+        time.sleep(WORK_POLL_SECONDS)
+
+    indexed.sort(key=lambda item: item[0])
+    scraper.results[:] = [business_data for index, business_data in indexed]
+    return scraper.results
+
+def check_journaled_params(request, job_id):
+    """Refuse to reuse a journaled job id for a different scrape"""
+    entry = journal.job(job_id) if job_id else None
+    if entry is None:
+        return
+    previous = SearchRequest(**entry["params"]).dict()
+    requested = request.dict()
+    previous.pop("job_id", None)
+    requested.pop("job_id", None)
+    if previous != requested:
+        changed = sorted(field for field in requested if requested[field] != previous.get(field))
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job {job_id} was started with different parameters ({', '.join(changed)}); "
+                   f"resume it with POST /jobs/{job_id}/resume or use a new job_id")
+
+def job_records(job):
+    """A live job's businesses so far, read from where its run keeps them
+
+    Streamed jobs hand records to the client instead of collecting them, so
+    single-query jobs are read from the journal and distributed jobs from the
+    work queue; only batches keep everything in the job's result list.
+    """
+    request = job.params
+    if not isinstance(request, SearchRequest):
+        return (business_data for business_data in job.partial_results() if business_data)
+    if request.distributed:
+        return queued_records(work_queue_job_id(job))
+    return (BusinessRecord.from_dict(business_data)
+            for index, business_data in journal.iter_completed(job.job_id, page_size=EXPORT_CHUNK_SIZE))
+
+def queued_records(queue_job_id):
+    """Businesses workers stored for a distributed run, in feed order, read page by page"""
+    return (BusinessRecord.from_dict(result)
+            for index, result in work_queue.iter_results(queue_job_id, page_size=EXPORT_CHUNK_SIZE))
+
+def submit_job(request, job_id=None, run=None):
+    if run is None:
+        run = run_distributed_job if getattr(request, "distributed", False) else run_scrape_job
+    # Decided by the request rather than by run, which /scrape/stream wraps
+    if isinstance(request, SearchRequest) and not request.distributed:
+        check_journaled_params(request, job_id or request.job_id)
+    try:
+        return job_manager.submit(run, request, job_id=job_id or request.job_id)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 @app.post("/scrape")
 async def scrape_businesses(request: SearchRequest):
+    job = submit_job(request)
     try:
-        # Initialize scraper
-        scraper = AdvancedContactExtractor(
-            search_query=request.search_query,
-            max_results=request.max_results,
-            visit_websites=request.visit_websites
-        )
-
-        # Run extraction
-        results = scraper.run_extraction()
-
-        # Format results
-        formatted_results = []
-        for business_data in results:
-            if business_data:
-                formatted_data = {
-                    "business_name": business_data.get("business_name", ""),
-                    "address": business_data.get("address"),
-                    "phone_no": business_data.get("phone_no"),
-                    "website": business_data.get("website"),
-                    "rating": business_data.get("rating"),
-                    "review_count": business_data.get("review_count"),
-                    "category": business_data.get("category"),
-                    "primary_email": business_data.get("primary_email"),
-                    "secondary_email": business_data.get("secondary_email"),
-                    "additional_contacts": json.loads(business_data.get("additional_contacts", "{}"))
-                }
-                formatted_results.append(formatted_data)
+        results = await asyncio.wrap_future(job.future)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Format results
+    formatted_results = [format_business(business_data) for business_data in results if business_data]
+
+    return {
+        "status": "success",
+        "message": f"Found {len(formatted_results)} businesses",
+        "pacing": job.scraper.pacer.stats(),
+        "network": job.scraper.resource_blocker.stats(),
+        "driver": job.scraper.watchdog.stats(),
+        **({"timings": job.scraper.timer.breakdown()} if request.include_timings else {}),
+        "data": formatted_results
+    }
+
+def format_event(event, data, stream_format):
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+@app.post("/scrape/stream")
+async def scrape_businesses_stream(request: SearchRequest, http_request: Request, format: str = "ndjson"):
+    """Stream each business as soon as it is extracted, as NDJSON or Server-Sent Events"""
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
 
+    loop = asyncio.get_event_loop()
+    events = asyncio.Queue()
+
+    def on_record(index, business_data):
+        loop.call_soon_threadsafe(events.put_nowait, (index, business_data))
+
+    run = run_distributed_job if request.distributed else run_scrape_job
+    job = submit_job(request, run=lambda job: run(job, on_record=on_record))
+    job.future.add_done_callback(lambda future: loop.call_soon_threadsafe(events.put_nowait, None))
+
+    async def event_stream():
+        try:
+            yield format_event("started", {"job_id": job.job_id}, format)
+            while True:
+                if await http_request.is_disconnected():
+                    print(f"Client disconnected, cancelling job {job.job_id}")
+                    job.cancel_event.set()
+                    return
+                try:
+                    item = await asyncio.wait_for(events.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield format_event("heartbeat", {"progress": job.progress()}, format)
+                    continue
+
+                if item is None:
+                    break
+                index, business_data = item
+                yield format_event("business", {"index": index, "data": format_business(business_data)}, format)
+                yield format_event("progress", {"progress": job.progress()}, format)
+
+            if job.status == "failed":
+                yield format_event("error", {"detail": job.error}, format)
+            else:
+                yield format_event("done", {"progress": job.progress()}, format)
+        finally:
+            # Also covers the response being cancelled mid-stream
+            job.cancel_event.set()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: SearchRequest):
+    job = submit_job(request)
+    return job.to_dict()
+
+@app.post("/batch", status_code=202)
+async def create_batch(request: BatchRequest):
+    """Queue many queries as one job; poll it with GET /jobs/{job_id}"""
+    if not request.queries or len(request.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=400, detail=f"Send between 1 and {MAX_BATCH_QUERIES} queries")
+    job = submit_job(request, run=run_batch_job)
+    return job.to_dict()
+
+@app.post("/jobs/{job_id}/resume", status_code=202)
+async def resume_job(job_id: str):
+    """Restart a journaled job with its original parameters, skipping finished places"""
+    entry = journal.job(job_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job = submit_job(SearchRequest(**entry["params"]), job_id=job_id)
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        # Jobs from before a restart are only in the journal, or in the work queue when distributed
+        entry = journal.job(job_id)
+        if entry is None:
+            queue_job_id = work_queue.latest_job(f"{job_id}:")
+            if queue_job_id is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            counts = work_queue.counts(queue_job_id)
+            return {
+                "job_id": job_id,
+                "status": "running" if counts.get("queued") or counts.get("leased") else "finished",
+                "places": counts,
+                "data": [format_business(business_data) for business_data in queued_records(queue_job_id)]
+            }
         return {
-            "status": "success",
-            "message": f"Found {len(formatted_results)} businesses",
-            "data": formatted_results
+            "job_id": job_id,
+            "status": entry["status"],
+            "places": journal.counts(job_id),
+            "data": [format_business(BusinessRecord.from_dict(business_data))
+                     for index, business_data in journal.completed(job_id)]
         }
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    data = job.to_dict()
+    if job.params.include_timings and job.scraper is not None:
+        data["timings"] = job.scraper.timer.breakdown()
+    data["data"] = [format_business(business_data) for business_data in job_records(job)]
+    return data
+
+@app.get("/jobs/{job_id}/export")
+def export_job(job_id: str, format: str = "csv"):
+    """Download a job's businesses as CSV or Parquet, written to disk in chunks"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    job = job_manager.get(job_id)
+    if job is not None:
+        records = job_records(job)
+    elif journal.job(job_id) is not None:
+        records = (BusinessRecord.from_dict(business_data)
+                   for index, business_data in journal.iter_completed(job_id, page_size=EXPORT_CHUNK_SIZE))
+    else:
+        queue_job_id = work_queue.latest_job(f"{job_id}:")
+        if queue_job_id is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        records = queued_records(queue_job_id)
+
+    media_type, suffix = EXPORT_FORMATS[format]
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        export_records(records, format, path, chunk_size=EXPORT_CHUNK_SIZE)
+    except RuntimeError as e:
+        os.remove(path)
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception:
+        os.remove(path)
+        raise
+    return FileResponse(path, media_type=media_type, filename=f"{job_id}{suffix}",
+                        background=BackgroundTask(os.remove, path))
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,91 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+
+PHASE_SECONDS = Histogram(
+    "scraper_phase_seconds", "Time spent in each scraper phase", ["phase"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600))
+PAGES_LOADED = Counter("scraper_pages_loaded_total", "Pages loaded by browser drivers")
+LINKS_FOUND = Counter("scraper_links_found_total", "Place links harvested from the results feed")
+BUSINESSES_EXTRACTED = Counter("scraper_businesses_extracted_total", "Businesses extracted")
+WEBSITES_VISITED = Counter("scraper_websites_visited_total", "Business websites visited", ["method"])
+EMAILS_FOUND = Counter("scraper_emails_found_total", "Emails attached to extracted businesses")
+PHONES_FOUND = Counter("scraper_phones_found_total", "Phone numbers attached to extracted businesses")
+FAILURES = Counter("scraper_failures_total", "Scraper failures", ["phase", "exception"])
+DRIVER_POOL_DRIVERS = Gauge("scraper_driver_pool_drivers", "Drivers in the pool", ["state"])
+JOBS = Gauge("scraper_jobs", "Scrape jobs in flight", ["status"])
+DRIVER_REPLACEMENTS = Counter("scraper_driver_replacements_total", "Drivers replaced mid-run by the watchdog", ["reason"])
+DRIVER_RSS_BYTES = Histogram(
+    "scraper_driver_rss_bytes", "Driver plus Chrome memory at each watchdog check",
+    buckets=tuple(mb * 1024 * 1024 for mb in (100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000)))
+PAGE_TIMEOUTS = Counter("scraper_page_timeouts_total", "Page loads that hit the page-load timeout")
+
+
+def record_failure(phase, error):
+    FAILURES.labels(phase, type(error).__name__).inc()
+
+
+def record_business(business_data):
+    BUSINESSES_EXTRACTED.inc()
+    extra = business_data.additional_contacts or {}
+    emails = [business_data.primary_email, business_data.secondary_email]
+    EMAILS_FOUND.inc(len([email for email in emails if email]) + len(extra.get('extra_emails', [])))
+    PHONES_FOUND.inc((1 if business_data.phone_no else 0) + len(extra.get('extra_phones', [])))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class PhaseTimer:
+    """Per-job time breakdown by phase that also feeds the shared histogram
+
+    Phases nest: place_details includes the website time of that place.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.counts = {}
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            PHASE_SECONDS.labels(name).observe(elapsed)
+            with self._lock:
+                self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+                self.counts[name] = self.counts.get(name, 0) + 1
+                self.samples.setdefault(name, []).append(elapsed)
+
+    def breakdown(self):
+        with self._lock:
+            return {
+                name: {
+                    "seconds": round(seconds, 3),
+                    "count": self.counts[name],
+                    "p50": round(percentile(self.samples[name], 50), 3),
+                    "p95": round(percentile(self.samples[name], 95), 3),
+                }
+                for name, seconds in self.seconds.items()
+            }
+
+
+def timed_phase(name):
+    """Time a scraper method under self.timer"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timer.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+import random
+import threading
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+THROTTLE_MARKERS = [
+    "unusual traffic",
+    "/sorry/",
+    "g-recaptcha",
+    "recaptcha/api",
+    "detected unusual",
+]
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+class Pacer:
+    """Central delay controller shared by every driver in a run
+
+    The delay between pages shrinks while pages load cleanly and backs off
+    exponentially when a throttling or captcha page is seen.
+    """
+
+    def __init__(self, min_delay=0.5, max_delay=20.0, initial_delay=1.5,
+                 speedup=0.85, backoff=2.0, poll_interval=0.2):
+        # A negative delay would make time.sleep raise mid-run
+        self.min_delay = max(0.0, min_delay)
+        self.max_delay = max(self.min_delay, max_delay)
+        self.delay = min(max(initial_delay, self.min_delay), self.max_delay)
+        self.speedup = speedup
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.time_waiting = 0.0
+        self.time_pausing = 0.0
+        self.throttle_events = 0
+        self._lock = threading.Lock()
+
+    def record_clean(self):
+        with self._lock:
+            self.delay = max(self.min_delay, self.delay * self.speedup)
+
+    def record_throttle(self):
+        with self._lock:
+            self.throttle_events += 1
+            self.delay = min(self.max_delay, self.delay * self.backoff)
+        print(f"Throttling detected, pacing delay now {self.delay:.1f}s")
+
+    def is_throttled(self, driver, page_source=None):
+        try:
+            url = driver.current_url
+            if page_source is None:
+                page_source = driver.page_source
+        except Exception:
+            return False
+        source = page_source[:200000].lower()
+        return any(marker in url or marker in source for marker in THROTTLE_MARKERS)
+
+    def observe(self, driver, page_source=None):
+        """Adjust the delay from the page the driver is on; True when throttled
+
+        Pass page_source when a snapshot was already taken to avoid fetching it again.
+        """
+        if self.is_throttled(driver, page_source):
+            self.record_throttle()
+            return True
+        self.record_clean()
+        return False
+
+    def pause(self):
+        """Sleep the current delay with jitter between pages"""
+        delay = self.delay * random.uniform(0.8, 1.2)
+        delay = min(max(delay, self.min_delay), self.max_delay)
+        time.sleep(delay)
+        with self._lock:
+            self.time_pausing += delay
+
+    def wait_for(self, driver, condition, timeout=10):
+        """Wait until condition(driver) is truthy; returns its value or None on timeout"""
+        started = time.monotonic()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=self.poll_interval).until(condition)
+        except TimeoutException:
+            return None
+        finally:
+            with self._lock:
+                self.time_waiting += time.monotonic() - started
+
+    def wait_until_ready(self, driver, timeout=15):
+        return self.wait_for(driver, document_ready, timeout)
+
+    def stats(self):
+        return {
+            "delay": round(self.delay, 2),
+            "time_waiting": round(self.time_waiting, 2),
+            "time_pausing": round(self.time_pausing, 2),
+            "throttle_events": self.throttle_events,
+        }
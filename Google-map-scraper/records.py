@@ -0,0 +1,57 @@
+import json
+
+# Export columns and their types; the first ten mirror the BusinessData response model
+EXPORT_SCHEMA = [
+    ("business_name", str),
+    ("address", str),
+    ("phone_no", str),
+    ("website", str),
+    ("rating", float),
+    ("review_count", int),
+    ("category", str),
+    ("primary_email", str),
+    ("secondary_email", str),
+    ("additional_contacts", dict),
+    ("google_maps_url", str),
+    ("search_query", str),
+    ("matched_queries", list),
+]
+
+
+class BusinessRecord:
+    """One extracted business
+
+    Slotted so that batches of thousands of records stay small in memory; cache,
+    journal and work queue keep the plain dict form from to_dict().
+    """
+
+    __slots__ = ("business_name", "address", "phone_no", "website", "rating", "review_count", "category",
+                 "primary_email", "secondary_email", "additional_contacts", "google_maps_url", "search_query",
+                 "matched_queries", "website_visited", "selector_version")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+        if self.additional_contacts is None:
+            self.additional_contacts = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        fields = dict(data)
+        # Rows written before additional_contacts was stored as a dict
+        if isinstance(fields.get("additional_contacts"), str):
+            fields["additional_contacts"] = json.loads(fields["additional_contacts"])
+        return cls(**fields)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    def export_row(self):
+        """Values in EXPORT_SCHEMA order, nested values as JSON text"""
+        row = []
+        for name, kind in EXPORT_SCHEMA:
+            value = getattr(self, name)
+            if kind in (dict, list):
+                value = json.dumps(value) if value else None
+            row.append(value)
+        return row
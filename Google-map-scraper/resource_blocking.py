@@ -0,0 +1,90 @@
+import json
+import threading
+
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+                  "*googleusercontent.com/*", "*gstatic.com/images/*", "*streetviewpixels*"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.gstatic.com/*", "*fonts.googleapis.com/*"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg"]
+MAP_TILE_PATTERNS = ["*/maps/vt?*", "*/maps/vt/*", "*/kh/v=*", "*khms*.google.com/*", "*/maps/preview/log204*"]
+TRACKER_PATTERNS = ["*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+                    "*facebook.net/*", "*connect.facebook.com/*", "*hotjar.com/*", "*/gen_204*", "*/log?format=*"]
+STYLESHEET_PATTERNS = ["*.css", "*.css?*"]
+
+# "minimal" keeps scripts and stylesheets the results feed needs to lay out and
+# scroll; "text-only" also drops stylesheets for pages that are only read.
+PROFILES = {
+    "none": [],
+    "minimal": IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + MAP_TILE_PATTERNS + TRACKER_PATTERNS,
+    "text-only": (IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + MAP_TILE_PATTERNS + TRACKER_PATTERNS
+                  + STYLESHEET_PATTERNS),
+}
+
+
+class ResourceBlocker:
+    """Applies blocked-URL profiles through the DevTools protocol and tallies network use
+
+    Chrome must be started with performance logging (see driver_pool.build_chrome_options)
+    for the byte counts; blocking itself works without it.
+    """
+
+    def __init__(self, enabled=True, profiles=None):
+        self.enabled = enabled
+        self.profiles = profiles or PROFILES
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self.blocked_requests = 0
+        self.blocked_by_type = {}
+        self._lock = threading.Lock()
+
+    def apply(self, driver, profile):
+        """Switch the driver's current tab to a blocking profile"""
+        patterns = self.profiles[profile] if self.enabled else []
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            print(f"Resource blocking error: {e}")
+
+    def collect(self, driver):
+        """Drain the driver's performance log into the counters"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return
+
+        request_types = {}
+        allowed_requests = 0
+        allowed_bytes = 0
+        blocked = {}
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                request_types[params.get("requestId")] = params.get("type", "Other")
+            elif method == "Network.loadingFinished":
+                allowed_requests += 1
+                allowed_bytes += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                resource_type = params.get("type") or request_types.get(params.get("requestId"), "Other")
+                blocked[resource_type] = blocked.get(resource_type, 0) + 1
+
+        with self._lock:
+            self.allowed_requests += allowed_requests
+            self.allowed_bytes += allowed_bytes
+            for resource_type, count in blocked.items():
+                self.blocked_requests += count
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "allowed_requests": self.allowed_requests,
+                "allowed_bytes": self.allowed_bytes,
+                "blocked_requests": self.blocked_requests,
+                "blocked_by_type": dict(self.blocked_by_type),
+            }
@@ -1,68 +1,148 @@
+import os
 import re
-import time
-import random
 import json
+import queue
+from collections import deque
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from selenium import webdriver
+from urllib.parse import urlsplit, unquote
+import requests
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from lxml import html
-import pandas as pd
+from driver_pool import create_driver, kill_driver
+from pacing import Pacer
+from detail_parser import parse_business_page, is_phone_number, UNKNOWN_BUSINESS
+from website_crawler import shared_crawler
+from feed_client import shared_feed_client, UnrecognizedPayload
+from cache import website_cache_key
+from contact_extractor import extract_contacts
+from resource_blocking import ResourceBlocker
+from records import BusinessRecord
+from watchdog import DriverWatchdog, under_deadline
+from metrics import (PhaseTimer, timed_phase, record_failure, record_business,
+                     PAGES_LOADED, LINKS_FOUND, WEBSITES_VISITED)
+
+# Overridable so benchmarks can point the scraper at a local fixture server
+MAPS_BASE_URL = os.environ.get("MAPS_BASE_URL", "https://www.google.com/maps")
+# How long an extra detail worker waits for a pooled driver before launching its own
+WORKER_DRIVER_WAIT = float(os.environ.get("WORKER_DRIVER_WAIT", "5"))
+RESULTS_READY_SELECTOR = "div[role='feed'], h1"
+CONSENT_BUTTON_XPATH = "//button/span[contains(text(),'Accept all')]"
+END_OF_LIST_MARKERS = [
+    "You've reached the end of the list",
+    "No more results",
+    "That's all the results"
+]
+
+# Installs a MutationObserver on the results panel that buffers place links and
+# end-of-list markers as the feed grows, so scrolling never rescans the document.
+HARVEST_INSTALL_SCRIPT = """
+const panel = arguments[0];
+const markers = arguments[1];
+if (window.__placeHarvest) { window.__placeHarvest.observer.disconnect(); }
+const state = {seen: new Set(), buffer: [], ended: false};
+const collect = (node) => {
+    if (node.nodeType !== Node.ELEMENT_NODE) { return; }
+    const anchors = node.matches('a[href*="/maps/place/"]')
+        ? [node] : node.querySelectorAll('a[href*="/maps/place/"]');
+    for (const anchor of anchors) {
+        if (!state.seen.has(anchor.href)) {
+            state.seen.add(anchor.href);
+            state.buffer.push(anchor.href);
+        }
+    }
+    if (!state.ended) {
+        const text = node.textContent || '';
+        state.ended = markers.some((marker) => text.includes(marker));
+    }
+};
+collect(panel);
+state.observer = new MutationObserver((mutations) => {
+    for (const mutation of mutations) {
+        mutation.addedNodes.forEach(collect);
+    }
+});
+state.observer.observe(panel, {childList: true, subtree: true});
+window.__placeHarvest = state;
+"""
+
+HARVEST_DRAIN_SCRIPT = """
+const state = window.__placeHarvest;
+return {links: state.buffer.splice(0), ended: state.ended};
+"""
+
+HARVEST_PENDING_SCRIPT = """
+const state = window.__placeHarvest;
+return state.buffer.length > 0 || state.ended;
+"""
+
+PLACE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)', re.IGNORECASE)
+
+
+def canonical_place_id(url):
+    """Stable identifier for a /maps/place/ URL
+
+    Uses the feature id embedded in the data parameter when present, otherwise
+    the place path without the viewport and query string.
+    """
+    match = PLACE_ID_PATTERN.search(url)
+    if match:
+        return match.group(1).lower()
+    path = unquote(urlsplit(url).path)
+    return path.split('/@')[0].split('/data=')[0].rstrip('/').lower()
+
 
 class AdvancedContactExtractor:
-    def __init__(self, search_query, max_results=20, visit_websites=True):
+    def __init__(self, search_query, max_results=20, visit_websites=True, driver=None,
+                 detail_workers=1, driver_pool=None, pacer=None, website_crawler=None,
+                 cache=None, cache_mode='use', cancel_event=None, resource_blocker=None, timer=None,
+                 journal=None, job_id=None, max_attempts=3, maps_base_url=None, harvest_mode='browser',
+                 feed_client=None, watchdog=None):
         self.search_query = search_query
+        self.maps_base_url = (maps_base_url or MAPS_BASE_URL).rstrip('/')
+        self.harvest_mode = harvest_mode
+        self.feed_client = feed_client or shared_feed_client()
         self.max_results = max_results
         self.visit_websites = visit_websites
+        self.detail_workers = max(1, detail_workers)
+        self.driver_pool = driver_pool
+        self.pacer = pacer or Pacer()
+        self.website_crawler = website_crawler or shared_crawler()
+        self.cache = cache
+        self.cache_mode = cache_mode
+        self.cancel_event = cancel_event or threading.Event()
+        self.resource_blocker = resource_blocker or ResourceBlocker()
+        self.timer = timer or PhaseTimer()
+        self.watchdog = watchdog or DriverWatchdog()
+        self.consecutive_timeouts = 0
+        self.driver_hung = False
+        self.active_deadline = None
+        self.last_from_cache = False
+        self.journal = journal if job_id else None
+        self.job_id = job_id
+        self.max_attempts = max_attempts
         self.extracted_count = 0
+        self.links_found = 0
         self.contacts_found = 0
         self.results = []
-
-        # Enhanced regex patterns for better contact extraction
-        self.email_patterns = [
-            re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            re.compile(r'mailto:([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})'),
-            re.compile(r'email[:\s]*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})', re.IGNORECASE),
-        ]
-
-        self.phone_patterns = [
-            re.compile(r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'),
-            re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
-            re.compile(r'\(\d{3}\)\s?\d{3}[-.]?\d{4}'),
-            re.compile(r'tel[:\s]*(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', re.IGNORECASE),
-        ]
-
-        # Setup browser
-        self.setup_browser()
+        self.pages_loaded = 0
+
+        # Setup browser, unless a pooled driver was handed in
+        self.owns_driver = driver is None
+        if driver is None:
+            self.setup_browser()
+        else:
+            self.driver = driver
+            self.wait = WebDriverWait(self.driver, 10)
+        self.watchdog.configure(self.driver)
 
     def setup_browser(self):
         """Setup Chrome browser with optimized settings for large datasets"""
         try:
-            self.chrome_options = Options()
-            self.chrome_options.add_argument("--headless")
-            self.chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            self.chrome_options.add_argument("--disable-dev-shm-usage")
-            self.chrome_options.add_argument("--no-sandbox")
-            self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            self.chrome_options.add_experimental_option('useAutomationExtension', False)
-
-            # Set Chrome binary location if specified in environment
-            import os
-            if os.environ.get("CHROME_BIN"):
-                self.chrome_options.binary_location = os.environ["CHROME_BIN"]
-
-            from selenium.webdriver.chrome.service import Service
-            from webdriver_manager.chrome import ChromeDriverManager
-
-            self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=self.chrome_options
-            )
-
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self.driver = create_driver()
             self.wait = WebDriverWait(self.driver, 10)
 
             print("✓ Browser setup completed")
@@ -72,82 +152,58 @@ class AdvancedContactExtractor:
             raise
 
     def extract_contacts_from_text(self, text):
-        """Enhanced contact extraction from text using multiple patterns"""
-        emails = set()
-        phones = set()
-
-        # Extract emails using multiple patterns
-        for pattern in self.email_patterns:
-            matches = pattern.findall(text)
-            for match in matches:
-                if isinstance(match, tuple):
-                    emails.update(match)
-                else:
-                    emails.add(match)
-
-        # Extract phones using multiple patterns
-        for pattern in self.phone_patterns:
-            matches = pattern.findall(text)
-            for match in matches:
-                if isinstance(match, tuple):
-                    phone = ''.join(match)
-                    if len(phone) >= 10:
-                        phones.add(phone)
-                else:
-                    clean_phone = re.sub(r'[^\d]', '', match)
-                    if len(clean_phone) >= 10:
-                        phones.add(match)
-
-        # Clean and validate emails
-        valid_emails = []
-        for email in emails:
-            email = email.strip().lower()
-            if '@' in email and '.' in email and len(email) > 5:
-                if not any(domain in email for domain in ['noreply', 'donotreply', 'no-reply']):
-                    valid_emails.append(email)
-
-        # Clean and validate phones
-        valid_phones = []
-        for phone in phones:
-            clean_phone = re.sub(r'[^\d+]', '', phone)
-            if len(clean_phone) >= 10 and len(clean_phone) <= 15:
-                if len(clean_phone) == 10:
-                    formatted = f"({clean_phone[:3]}) {clean_phone[3:6]}-{clean_phone[6:]}"
-                    valid_phones.append(formatted)
-                elif len(clean_phone) == 11 and clean_phone.startswith('1'):
-                    formatted = f"({clean_phone[1:4]}) {clean_phone[4:7]}-{clean_phone[7:]}"
-                    valid_phones.append(formatted)
-
-        return {
-            'emails': list(set(valid_emails))[:3],
-            'phones': list(set(valid_phones))[:3]
-        }
+        """Emails and phone numbers from page HTML or plain text"""
+        return extract_contacts(text)
+
+    def load_page(self, url, blocking_profile=None):
+        """Navigate the driver, counting pages for pool recycling"""
+        if blocking_profile:
+            self.resource_blocker.apply(self.driver, blocking_profile)
+        self.pages_loaded += 1
+        PAGES_LOADED.inc()
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            self.consecutive_timeouts += 1
+            self.watchdog.record_timeout()
+            raise
+        self.consecutive_timeouts = 0
+        self.resource_blocker.collect(self.driver)
 
+    @timed_phase('search')
+    @under_deadline
     def search_google_maps(self):
         """Navigate to Google Maps and perform search"""
         try:
-            search_url = f"https://www.google.com/maps/search/{self.search_query.replace(' ', '+')}"
+            search_url = f"{self.maps_base_url}/search/{self.search_query.replace(' ', '+')}"
             print(f"Searching: {search_url}")
 
-            self.driver.get(search_url)
-            time.sleep(5)
-
-            # Handle cookie consent if present
-            try:
-                accept_button = self.wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//button/span[contains(text(),'Accept all')]"))
-                )
-                accept_button.click()
-                time.sleep(5)
-            except TimeoutException:
+            self.load_page(search_url, "minimal")
+            self.pacer.wait_until_ready(self.driver)
+
+            # Handle cookie consent if present, otherwise the results are already there
+            self.pacer.wait_for(self.driver, lambda d: (
+                d.find_elements(By.XPATH, CONSENT_BUTTON_XPATH)
+                or d.find_elements(By.CSS_SELECTOR, RESULTS_READY_SELECTOR)
+            ), timeout=15)
+            consent_buttons = self.driver.find_elements(By.XPATH, CONSENT_BUTTON_XPATH)
+            if consent_buttons:
+                consent_buttons[0].click()
+                self.pacer.wait_for(self.driver, EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, RESULTS_READY_SELECTOR)), timeout=15)
+            else:
                 print("No cookie consent found")
 
+            self.pacer.observe(self.driver)
             return True
 
         except Exception as e:
             print(f"Search error: {e}")
+            record_failure('search', e)
             return False
 
+    @timed_phase('harvest')
+    @under_deadline
     def get_business_links_advanced(self):
         """Advanced business link extraction with better pagination"""
         try:
@@ -168,57 +224,125 @@ class AdvancedContactExtractor:
 
             if not scrollable_div:
                 print("Could not find scrollable panel")
-                return []
+                return None
 
-            all_links = set()
+            # Observe the panel so each scroll only returns what it added
+            self.driver.execute_script(HARVEST_INSTALL_SCRIPT, scrollable_div, END_OF_LIST_MARKERS)
+
+            all_links = []
+            seen = set()
             scroll_attempts = 0
-            max_scrolls = min(50, self.max_results // 10)
+            max_scrolls = self.max_results // 4 + 10
             no_new_content_count = 0
 
-            while scroll_attempts < max_scrolls and len(all_links) < self.max_results:
-                page_source = self.driver.page_source
-                tree = html.fromstring(page_source)
-                current_links = tree.xpath('//a[contains(@href, "/maps/place/")]/@href')
-
-                new_links_count = 0
-                for link in current_links:
-                    if link.startswith('/'):
-                        link = 'https://www.google.com' + link
-                    if link not in all_links:
-                        all_links.add(link)
-                        new_links_count += 1
-
-                if new_links_count == 0:
+            def drain():
+                """Move buffered links into all_links, one per place; returns (added, ended)"""
+                harvest = self.driver.execute_script(HARVEST_DRAIN_SCRIPT)
+                added = 0
+                for link in harvest['links']:
+                    place_id = canonical_place_id(link)
+                    if place_id not in seen:
+                        seen.add(place_id)
+                        all_links.append(link)
+                        added += 1
+                return added, harvest['ended']
+
+            while (scroll_attempts < max_scrolls and len(all_links) < self.max_results
+                   and not self.cancelled()):
+                added, ended = drain()
+
+                if not added:
                     no_new_content_count += 1
                     if no_new_content_count >= 3:
                         break
                 else:
                     no_new_content_count = 0
 
-                self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div)
-                time.sleep(random.uniform(2, 4))
-
-                if any(indicator in page_source for indicator in [
-                    "You've reached the end of the list",
-                    "No more results",
-                    "That's all the results"
-                ]):
+                if ended:
                     break
 
+                # Scroll, then wait for the feed to grow instead of sleeping
+                self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div)
+                self.pacer.wait_for(self.driver, lambda d: d.execute_script(HARVEST_PENDING_SCRIPT), timeout=8)
+
                 scroll_attempts += 1
+                # Each scroll that returns gets a fresh deadline; only a hung one is killed
+                self.active_deadline.renew()
 
-            return list(all_links)[:self.max_results]
+            if scroll_attempts >= max_scrolls and len(all_links) < self.max_results:
+                # Links the last scroll loaded are still in the buffer
+                drain()
+
+            return all_links[:self.max_results]
 
         except Exception as e:
+            # None, not [], so a harvest cut short by a dead driver is never journaled as done
             print(f"Pagination error: {e}")
-            return []
+            record_failure('harvest', e)
+            return None
 
+    def harvest_links(self):
+        """Deduplicated place links for the query, or None when the search failed
+
+        In 'direct' harvest mode the results feed is fetched without a browser;
+        the browser scroll is the fallback when the feed cannot be read.
+        """
+        if self.harvest_mode == 'direct':
+            links = self.harvest_links_direct()
+            if links is not None:
+                return self.dedupe_links(links)
+            print("Falling back to browser harvesting")
+
+        links = self.get_business_links_advanced() if self.search_google_maps() else None
+        if self.driver_hung:
+            # Hand the job a working driver again; the harvest itself is not journaled
+            self.check_driver()
+        if links is None:
+            return None
+        return self.dedupe_links(links)
+
+    @timed_phase('harvest')
+    def harvest_links_direct(self):
+        """Place links from the results feed over plain HTTP, or None if it is not readable"""
+        try:
+            links = self.feed_client.harvest(self.maps_base_url, self.search_query, self.max_results,
+                                             should_stop=self.cancelled)
+            print(f"Harvested {len(links)} links from the results feed")
+            return links
+        except (UnrecognizedPayload, requests.RequestException) as e:
+            print(f"Direct harvest error: {e}")
+            record_failure('harvest', e)
+            return None
+
+    @timed_phase('place_details')
+    @under_deadline
     def extract_business_contacts(self, business_url):
         """Extract detailed contact information from business page"""
+        place_id = canonical_place_id(business_url)
+        cached = self.cache_lookup('place', place_id)
+        if cached is not None and not (self.visit_websites and cached.get('website')
+                                       and not cached.get('website_visited')):
+            self.last_from_cache = True
+            record = BusinessRecord.from_dict(cached)
+            record.google_maps_url = business_url
+            record.search_query = self.search_query
+            return record
+        self.last_from_cache = False
+
         try:
-            self.driver.get(business_url)
+            self.load_page(business_url, "text-only")
+            if self.pacer.wait_for(self.driver, EC.presence_of_element_located((By.CSS_SELECTOR, "h1")),
+                                   timeout=15) is None:
+                # Not a rendered place page; fail the attempt so it is retried
+                if self.pacer.is_throttled(self.driver):
+                    # Captcha pages have no place heading either; back off before the retry
+                    print(f"Throttled on {business_url}")
+                    self.pacer.record_throttle()
+                    self.pacer.pause()
+                else:
+                    print(f"No place heading on {business_url}")
+                return None
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(3, 6))
 
             data = {
                 'google_maps_url': business_url,
@@ -227,59 +351,26 @@ class AdvancedContactExtractor:
                 'additional_contacts': {}
             }
 
-            # Extract basic business info
-            try:
-                name_element = self.driver.find_element(By.CSS_SELECTOR, "h1")
-                data['business_name'] = name_element.text.strip()
-            except:
-                data['business_name'] = "Unknown Business"
-
+            # Bring the address block into view, then parse a single page snapshot
             try:
                 scrollable_div = self.driver.find_element(By.XPATH,
                                                           '//div[@role="main"]//div[contains(@class, "m6QErb")]')
                 self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div)
-                time.sleep(2)
-                address_element = WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.XPATH, "//button[@data-item-id='address']"))
-                )
-                data['address'] = address_element.text.strip()
-            except:
-                data['address'] = "Address not found"
-
-            try:
-                rating_element = self.driver.find_element(By.CSS_SELECTOR, "span.MW4etd")
-                data['rating'] = float(rating_element.text.strip())
-            except:
-                data['rating'] = None
-
-            try:
-                review_element = self.driver.find_element(By.CSS_SELECTOR, "span.UY7F9")
-                review_text = review_element.text.strip()
-                data['review_count'] = int(re.sub(r'[^\d]', '', review_text))
-            except:
-                data['review_count'] = None
-
-            try:
-                category_element = self.driver.find_element(By.CSS_SELECTOR, "button[jsaction*='category']")
-                data['category'] = category_element.text.strip()
-            except:
-                data['category'] = "Unknown Category"
-
-            try:
-                website_element = self.driver.find_element(By.CSS_SELECTOR, "[data-item-id='authority']")
-                data['website'] = website_element.get_attribute('href')
-            except:
-                data['website'] = None
-
-            try:
-                elements = self.driver.find_elements(By.XPATH,
-                                                     "//div[@class='rogA2c ']/div[@class='Io6YTe fontBodyMedium kR99db fdkmkc ']")
-                data['phone_no'] = next((el.text.strip() for el in elements if self.is_phone_number(el.text.strip())), None)
-            except:
-                data['phone_no'] = None
+                self.pacer.wait_for(self.driver, EC.visibility_of_element_located(
+                    (By.XPATH, "//button[@data-item-id='address']")), timeout=10)
+            except NoSuchElementException:
+                pass
+
+            page_source = self.driver.page_source
+            if self.pacer.observe(self.driver, page_source):
+                # A captcha page is not the place; back off and let the retry path have it
+                print(f"Throttled on {business_url}")
+                self.pacer.pause()
+                return None
+            data.update(parse_business_page(page_source))
 
             # Extract contacts from Google Maps page
-            page_contacts = self.extract_contacts_from_text(self.driver.page_source)
+            page_contacts = self.extract_contacts_from_text(page_source)
             data['primary_email'] = page_contacts['emails'][0] if page_contacts['emails'] else None
             data['secondary_email'] = page_contacts['emails'][1] if len(page_contacts['emails']) > 1 else None
 
@@ -303,23 +394,63 @@ class AdvancedContactExtractor:
                         'website_source': True
                     }
 
-            return data
+            if data['business_name'] != UNKNOWN_BUSINESS:
+                self.cache_store('place', place_id, data)
+            return BusinessRecord.from_dict(data)
 
         except Exception as e:
             print(f"Error extracting business: {e}")
+            record_failure('place_details', e)
             return None
 
     def is_phone_number(self, text):
-        cleaned = text.replace(" ", "").replace("-", "").replace("+", "")
-        return cleaned.isdigit() and len(cleaned) >= 6
+        return is_phone_number(text)
 
+    @timed_phase('website')
     def extract_from_website(self, website_url):
-        """Extract additional contacts from business website"""
+        """Extract additional contacts from business website
+
+        Plain HTTP first; a browser tab only when the HTML has no usable content.
+        """
+        cache_key = website_cache_key(website_url)
+        website_contacts = self.cache_lookup('website', cache_key)
+        if website_contacts is not None:
+            return website_contacts
+
+        try:
+            website_contacts = self.website_crawler.crawl(website_url, self.extract_contacts_from_text)
+        except Exception as e:
+            print(f"Website crawl error: {e}")
+            record_failure('website', e)
+
+        if website_contacts is not None:
+            WEBSITES_VISITED.labels('http').inc()
+        else:
+            WEBSITES_VISITED.labels('browser').inc()
+            website_contacts = self.extract_from_website_browser(website_url)
+
+        if website_contacts is not None:
+            self.cache_store('website', cache_key, website_contacts)
+        return website_contacts
+
+    def cache_lookup(self, namespace, key):
+        if self.cache is None or self.cache_mode != 'use':
+            return None
+        return self.cache.get(namespace, key)
+
+    def cache_store(self, namespace, key, value):
+        if self.cache is not None and self.cache_mode != 'bypass':
+            self.cache.set(namespace, key, value)
+
+    def extract_from_website_browser(self, website_url):
+        """Extract additional contacts by rendering the website in a new tab"""
+        main_window = self.driver.current_window_handle
         try:
             print(f"Visiting website: {website_url}")
-            self.driver.execute_script(f"window.open('{website_url}', '_blank');")
+            self.driver.execute_script("window.open('about:blank', '_blank');")
             self.driver.switch_to.window(self.driver.window_handles[-1])
-            time.sleep(10)
+            self.load_page(website_url, "text-only")
+            self.pacer.wait_until_ready(self.driver)
 
             website_contacts = self.extract_contacts_from_text(self.driver.page_source)
 
@@ -330,55 +461,272 @@ class AdvancedContactExtractor:
             if contact_links and len(contact_links) > 0:
                 try:
                     contact_links[0].click()
-                    time.sleep(5)
+                    self.pacer.wait_for(self.driver, EC.staleness_of(contact_links[0]), timeout=5)
+                    self.pacer.wait_until_ready(self.driver)
                     contact_page_contacts = self.extract_contacts_from_text(self.driver.page_source)
                     website_contacts['emails'].extend(contact_page_contacts['emails'])
                     website_contacts['phones'].extend(contact_page_contacts['phones'])
                 except:
                     pass
 
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
+            self.close_tabs(main_window)
             return website_contacts
 
         except Exception as e:
             print(f"Website extraction error: {e}")
-            if len(self.driver.window_handles) > 1:
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-            return {'emails': [], 'phones': []}
+            record_failure('website', e)
+            try:
+                self.close_tabs(main_window)
+            except Exception as close_error:
+                print(f"Tab cleanup error: {close_error}")
+            return None
 
-    def run_extraction(self):
-        """Main extraction process optimized for large datasets and contact extraction"""
+    def close_tabs(self, keep):
+        """Close every tab but keep, including ones a clicked link opened"""
+        for handle in self.driver.window_handles:
+            if handle != keep:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.driver.switch_to.window(keep)
+
+    def check_driver(self):
+        """Replace the driver if the watchdog finds it hung or over budget; progress stays with the extractor"""
+        if self.driver_hung:
+            reason = 'hung'
+        else:
+            # The probe itself can block on a hung driver
+            with self.watchdog.deadline(self.driver, self.watchdog.page_load_timeout):
+                reason = self.watchdog.check(self.driver, self.consecutive_timeouts)
+        if reason is None:
+            return
+        print(f"Replacing driver ({reason})")
+        if reason not in ('hung', 'unresponsive'):
+            self.resource_blocker.collect(self.driver)
+        if self.driver_pool is not None and not self.owns_driver:
+            self.driver = self.driver_pool.replace(self.driver)
+        else:
+            kill_driver(self.driver)
+            self.driver = create_driver()
+        self.wait = WebDriverWait(self.driver, 10)
+        self.watchdog.configure(self.driver)
+        self.watchdog.record_replacement(reason)
+        self.consecutive_timeouts = 0
+        self.driver_hung = False
+        self.pages_loaded = 0
+
+    def run_extraction(self, on_record=None):
+        """Main extraction process optimized for large datasets and contact extraction
+
+        With on_record(index, business_data) each business is handed over as soon
+        as it is extracted instead of being collected into self.results. On an
+        unexpected error the businesses extracted so far are still returned.
+        """
+        indexed = []
         try:
-            if not self.search_google_maps():
-                return []
-
-            business_links = self.get_business_links_advanced()
-            if not business_links:
-                return []
-
-            results = []
-            for i, link in enumerate(business_links, 1):
-                business_data = self.extract_business_contacts(link)
-                if business_data:
-                    results.append(business_data)
-                    self.extracted_count += 1
-
-                time.sleep(random.uniform(2, 5))
-
-            return results
+            for index, business_data in self.iter_extraction():
+                if on_record is not None:
+                    on_record(index, business_data)
+                else:
+                    indexed.append((index, business_data))
+                    self.results.append(business_data)
 
         except Exception as e:
             print(f"Extraction error: {e}")
-            return []
+            record_failure('extraction', e)
         finally:
             self.cleanup()
 
+        # Parallel workers finish out of order; restore feed order
+        indexed.sort(key=lambda item: item[0])
+        self.results[:] = [business_data for index, business_data in indexed]
+        return self.results
+
+    def iter_extraction(self):
+        """Yield (feed index, business data) for each business as soon as it is extracted
+
+        With a journal, links and finished places of an earlier run of the same
+        job are reused and only the remaining places are visited.
+        """
+        business_links = self.journal.links(self.job_id) if self.journal else None
+        if business_links is None:
+            business_links = self.harvest_links()
+            if business_links is None or self.cancelled():
+                # A partial harvest must not be reused when the job is resumed
+                return
+            if self.journal:
+                self.journal.save_links(self.job_id, business_links)
+        else:
+            print(f"Resuming job {self.job_id} with {len(business_links)} journaled links")
+
+        self.links_found = len(business_links)
+        LINKS_FOUND.inc(self.links_found)
+
+        finished = set()
+        attempts = {}
+        if self.journal:
+            for index, business_data in self.journal.completed(self.job_id):
+                finished.add(index)
+                self.extracted_count += 1
+                yield index, BusinessRecord.from_dict(business_data)
+            attempts = self.journal.attempts(self.job_id)
+
+        pending = [(index, link, attempts.get(index, 0)) for index, link in enumerate(business_links)
+                   if index not in finished and attempts.get(index, 0) < self.max_attempts]
+        if not pending:
+            return
+
+        yield from self.iter_details(pending)
+
+    def iter_details(self, pending_places):
+        """Extract (index, link, tries) places, in parallel when several workers are allowed"""
+        if self.detail_workers > 1 and len(pending_places) > 1:
+            yield from self.iter_details_parallel(pending_places)
+            return
+
+        pending = deque(pending_places)
+        while pending:
+            if self.cancelled():
+                print("Extraction cancelled")
+                return
+            index, link, tries = pending.popleft()
+            business_data = self.extract_business_contacts(link)
+            if business_data:
+                self.place_done(index, business_data)
+                yield index, business_data
+            elif self.place_failed(index, link, tries + 1):
+                pending.append((index, link, tries + 1))
+
+            self.after_place()
+
+    def after_place(self):
+        """Check the driver and pace, unless the place came from the cache without loading a page"""
+        if self.last_from_cache:
+            return
+        self.check_driver()
+        self.pacer.pause()
+
+    def place_done(self, index, business_data):
+        self.extracted_count += 1
+        record_business(business_data)
+        if self.journal:
+            self.journal.record_done(self.job_id, index, business_data.to_dict())
+
+    def place_failed(self, index, link, tries):
+        """Journal a failed place; True when it should be retried"""
+        if self.journal:
+            self.journal.record_failure(self.job_id, index, "extraction failed")
+        if tries < self.max_attempts:
+            print(f"Retrying {link} (attempt {tries + 1} of {self.max_attempts})")
+            return True
+        print(f"Giving up on {link} after {tries} attempts")
+        return False
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def dedupe_links(self, links):
+        """Drop links that point at an already seen place, keeping order"""
+        seen = set()
+        unique_links = []
+        for link in links:
+            place_id = canonical_place_id(link)
+            if place_id not in seen:
+                seen.add(place_id)
+                unique_links.append(link)
+        return unique_links
+
+    def spawn_worker(self):
+        """Extractor sharing this run's settings on its own driver"""
+        driver = self.driver_pool.try_checkout(WORKER_DRIVER_WAIT) if self.driver_pool else None
+        worker = AdvancedContactExtractor(
+            search_query=self.search_query,
+            max_results=self.max_results,
+            visit_websites=self.visit_websites,
+            driver=driver,
+            driver_pool=self.driver_pool,
+            pacer=self.pacer,
+            website_crawler=self.website_crawler,
+            cache=self.cache,
+            cache_mode=self.cache_mode,
+            resource_blocker=self.resource_blocker,
+            timer=self.timer,
+            maps_base_url=self.maps_base_url,
+            harvest_mode=self.harvest_mode,
+            feed_client=self.feed_client,
+            watchdog=self.watchdog,
+            cancel_event=self.cancel_event
+        )
+        worker.from_pool = driver is not None
+        return worker
+
+    def release_worker(self, worker):
+        if worker.from_pool:
+            self.resource_blocker.collect(worker.driver)
+            self.driver_pool.checkin(worker.driver, worker.pages_loaded)
+        else:
+            worker.cleanup()
+
+    def iter_details_parallel(self, pending_places):
+        """Spread detail extraction over several drivers, yielding results as workers finish"""
+        workers = [self]
+        for _ in range(min(self.detail_workers, len(pending_places)) - 1):
+            try:
+                workers.append(self.spawn_worker())
+            except Exception as e:
+                print(f"Detail worker setup error: {e}")
+                break
+        print(f"Extracting {len(pending_places)} businesses with {len(workers)} workers")
+
+        pending = queue.Queue()
+        for item in pending_places:
+            pending.put(item)
+        finished = queue.Queue()
+        stop = threading.Event()
+        worker_done = object()
+
+        def work(worker):
+            try:
+                while not (stop.is_set() or self.cancelled()):
+                    try:
+                        index, link, tries = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    business_data = worker.extract_business_contacts(link)
+                    if business_data:
+                        finished.put((index, business_data))
+                    elif self.place_failed(index, link, tries + 1):
+                        pending.put((index, link, tries + 1))
+
+                    worker.after_place()
+            finally:
+                finished.put(worker_done)
+
+        executor = ThreadPoolExecutor(max_workers=len(workers))
+        try:
+            for worker in workers:
+                executor.submit(work, worker)
+
+            running = len(workers)
+            while running:
+                item = finished.get()
+                if item is worker_done:
+                    running -= 1
+                    continue
+                self.place_done(*item)
+                yield item
+        finally:
+            # Also reached when the consumer stops early: let workers wind down
+            stop.set()
+            executor.shutdown(wait=True)
+            for worker in workers[1:]:
+                self.release_worker(worker)
+
     def cleanup(self):
         """Clean up resources"""
         try:
             if hasattr(self, 'driver'):
+                self.resource_blocker.collect(self.driver)
+            if hasattr(self, 'driver') and self.owns_driver:
                 self.driver.quit()
         except Exception as e:
             print(f"Cleanup error: {e}")
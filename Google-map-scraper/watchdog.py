@@ -0,0 +1,158 @@
+import functools
+import threading
+from driver_pool import driver_rss, kill_driver
+from metrics import DRIVER_REPLACEMENTS, DRIVER_RSS_BYTES, PAGE_TIMEOUTS
+
+
+class DriverWatchdog:
+    """Keeps a run's drivers inside time and memory budgets
+
+    Page-load and script timeouts stop a hung page from blocking the run, and a
+    per-place deadline catches a hung chromedriver, which Selenium would wait on
+    forever. After each place the driver is checked: extra tabs are closed, and
+    a driver that stopped responding, keeps timing out or is over its memory
+    budget is reported so the extractor can swap in a fresh one.
+    """
+
+    def __init__(self, page_load_timeout=30, script_timeout=15, max_rss_mb=1500, max_windows=3,
+                 max_consecutive_timeouts=2, place_timeout=180):
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.max_windows = max_windows
+        self.max_consecutive_timeouts = max_consecutive_timeouts
+        self.place_timeout = place_timeout
+        self.checks = 0
+        self.timeouts = 0
+        self.deadlines_expired = 0
+        self.tabs_closed = 0
+        self.replacements = {}
+        self.last_rss = 0
+        self.peak_rss = 0
+        self.peak_windows = 0
+        self._lock = threading.Lock()
+
+    def configure(self, driver):
+        driver.set_page_load_timeout(self.page_load_timeout)
+        driver.set_script_timeout(self.script_timeout)
+
+    def deadline(self, driver, seconds=None):
+        """Context that kills driver if the block is still running after seconds (default place_timeout)"""
+        return DriverDeadline(self, driver, seconds or self.place_timeout)
+
+    def record_timeout(self):
+        PAGE_TIMEOUTS.inc()
+        with self._lock:
+            self.timeouts += 1
+
+    def check(self, driver, consecutive_timeouts=0):
+        """Reason the driver must be replaced ('unresponsive', 'timeouts', 'memory'), or None"""
+        if consecutive_timeouts >= self.max_consecutive_timeouts:
+            return 'timeouts'
+        try:
+            handles = driver.window_handles
+            window_count = len(handles)
+            closed = 0
+            if len(handles) > self.max_windows:
+                # Tabs leaked by website visits that navigated away unexpectedly
+                for handle in handles[1:]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                    closed += 1
+                driver.switch_to.window(handles[0])
+        except Exception as e:
+            print(f"Driver health check error: {e}")
+            return 'unresponsive'
+
+        rss = driver_rss(driver)
+        DRIVER_RSS_BYTES.observe(rss)
+        with self._lock:
+            self.checks += 1
+            self.tabs_closed += closed
+            self.last_rss = rss
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_windows = max(self.peak_windows, window_count)
+        if rss >= self.max_rss_bytes:
+            return 'memory'
+        return None
+
+    def record_replacement(self, reason):
+        DRIVER_REPLACEMENTS.labels(reason).inc()
+        with self._lock:
+            self.replacements[reason] = self.replacements.get(reason, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "checks": self.checks,
+                "page_timeouts": self.timeouts,
+                "tabs_closed": self.tabs_closed,
+                "deadlines_expired": self.deadlines_expired,
+                "replacements": dict(self.replacements),
+                "rss_mb": round(self.last_rss / 1024 / 1024, 1),
+                "peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+                "peak_window_handles": self.peak_windows,
+            }
+
+
+class DriverDeadline:
+    """Kills a driver from a timer thread once its deadline passes
+
+    The WebDriver call blocked on the dead driver then fails, and the caller's
+    usual error handling and driver replacement take over.
+    """
+
+    def __init__(self, watchdog, driver, seconds):
+        self.watchdog = watchdog
+        self.driver = driver
+        self.seconds = seconds
+        self.expired = False
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._timer = threading.Timer(self.seconds, self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def __enter__(self):
+        self._start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._timer.cancel()
+        return False
+
+    def renew(self):
+        """Restart the countdown, for long work such as harvesting that keeps making progress"""
+        with self._lock:
+            if self.expired:
+                return
+            self._timer.cancel()
+            self._start()
+
+    def _expire(self):
+        with self._lock:
+            self.expired = True
+        print(f"Driver still busy after {self.seconds:.0f}s, killing it")
+        with self.watchdog._lock:
+            self.watchdog.deadlines_expired += 1
+        kill_driver(self.driver)
+
+
+def under_deadline(method):
+    """Run a scraper method under self.watchdog's place deadline, flagging self.driver_hung when it expires
+
+    The deadline is self.active_deadline while the method runs, so loops can renew it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.watchdog.deadline(self.driver) as deadline:
+            self.active_deadline = deadline
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.active_deadline = None
+                if deadline.expired:
+                    self.driver_hung = True
+    return wrapper
@@ -0,0 +1,186 @@
+import codecs
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from lxml import html
+
+# Keyword -> score for ranking links that likely carry contact details
+CANDIDATE_KEYWORDS = {
+    'contact': 5,
+    'kontakt': 5,
+    'contacto': 5,
+    'impressum': 4,
+    'imprint': 4,
+    'legal': 2,
+    'about': 2,
+    'team': 1,
+}
+
+HEADER_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/114.0 Safari/537.36")
+
+def page_encoding(content_type, body):
+    """Charset from the Content-Type header, else the page's <meta>, else UTF-8 or detected from the bytes
+
+    requests assumes ISO-8859-1 for text/html without a charset, which garbles
+    UTF-8 sites; apparent_encoding is not available on a streamed response, so
+    the same detection runs on the bytes read.
+    """
+    match = HEADER_CHARSET_PATTERN.search(content_type) or META_CHARSET_PATTERN.search(body[:4096])
+    if match:
+        encoding = match.group(1)
+        encoding = encoding.decode("ascii") if isinstance(encoding, bytes) else encoding
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    try:
+        body.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A page cut at max_bytes may end inside a character
+        if e.start >= len(body) - 3:
+            return "utf-8"
+    return chardet.detect(body).get("encoding") or "utf-8"
+
+
+_shared_crawler = None
+_shared_lock = threading.Lock()
+
+
+def shared_crawler():
+    """Process-wide crawler so every scraper shares one connection pool"""
+    global _shared_crawler
+    with _shared_lock:
+        if _shared_crawler is None:
+            _shared_crawler = WebsiteCrawler()
+        return _shared_crawler
+
+
+class WebsiteCrawler:
+    """Fetch business websites over pooled HTTP connections instead of a browser tab"""
+
+    def __init__(self, timeout=(3.05, 8), max_bytes=1500000, max_candidates=3,
+                 per_host_limit=4, pool_size=32, min_text_chars=200):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_candidates = max_candidates
+        self.per_host_limit = per_host_limit
+        self.min_text_chars = min_text_chars
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=per_host_limit, max_retries=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="website-fetch")
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def fetch(self, url):
+        """GET an HTML page, capped at max_bytes; returns (final_url, text) or None"""
+        try:
+            with self._host_slot(url):
+                with self.session.get(url, timeout=self.timeout, stream=True, allow_redirects=True) as response:
+                    if response.status_code >= 400:
+                        return None
+                    content_type = response.headers.get("Content-Type", "")
+                    if content_type and "html" not in content_type:
+                        return None
+
+                    body = bytearray()
+                    for chunk in response.iter_content(chunk_size=65536):
+                        body += chunk
+                        if len(body) >= self.max_bytes:
+                            del body[self.max_bytes:]
+                            break
+
+                    body = bytes(body)
+                    return response.url, body.decode(page_encoding(content_type, body), errors="replace")
+        except (requests.RequestException, LookupError) as e:
+            print(f"Website fetch error for {url}: {e}")
+            return None
+
+    def has_usable_content(self, tree, page_html):
+        """False for script-only shells that need a real browser to render"""
+        if "mailto:" in page_html or "tel:" in page_html:
+            return True
+        for element in tree.xpath('//script|//style|//noscript'):
+            element.drop_tree()
+        text = " ".join(tree.text_content().split())
+        return len(text) >= self.min_text_chars
+
+    def candidate_links(self, base_url, tree):
+        """Same-site links ranked by how likely they lead to contact details"""
+        base_host = urlsplit(base_url).netloc.lower()
+        scored = {}
+        for anchor in tree.xpath('//a[@href]'):
+            href = anchor.get('href').strip()
+            if href.startswith(('mailto:', 'tel:', 'javascript:', '#')):
+                continue
+            url = urljoin(base_url, href).split('#')[0]
+            if urlsplit(url).netloc.lower() != base_host or url.rstrip('/') == base_url.rstrip('/'):
+                continue
+            label = (href + " " + anchor.text_content()).lower()
+            score = sum(weight for keyword, weight in CANDIDATE_KEYWORDS.items() if keyword in label)
+            if score and score > scored.get(url, 0):
+                scored[url] = score
+
+        ranked = sorted(scored.items(), key=lambda item: -item[1])
+        return [url for url, score in ranked[:self.max_candidates]]
+
+    def crawl(self, website_url, extract_contacts):
+        """Homepage plus ranked contact pages; None when a browser is needed
+
+        A site that is unreachable, answers with an error or is not HTML gets empty
+        contacts: a browser would not do better, only slower.
+        """
+        homepage = self.fetch(website_url)
+        if homepage is None:
+            return {'emails': [], 'phones': [], 'pages_fetched': 0}
+        final_url, page_html = homepage
+
+        try:
+            tree = html.fromstring(page_html)
+        except Exception:
+            return None
+
+        candidates = self.candidate_links(final_url, tree)
+        if not self.has_usable_content(tree, page_html):
+            return None
+
+        pages = [page_html]
+        for page in self._executor.map(self.fetch, candidates):
+            if page is not None:
+                pages.append(page[1])
+
+        emails = []
+        phones = []
+        for page in pages:
+            contacts = extract_contacts(page)
+            emails.extend(contacts['emails'])
+            phones.extend(contacts['phones'])
+
+        return {
+            'emails': list(dict.fromkeys(emails)),
+            'phones': list(dict.fromkeys(phones)),
+            'pages_fetched': len(pages),
+        }
@@ -0,0 +1,137 @@
+"""Standalone scraper worker: pulls place tasks from the work queue
+
+    python -m worker [--queue-url sqlite:///scraper_queue.db]
+
+Start as many as the machine (or cluster, with a networked queue) can run;
+throughput scales with the number of workers.
+"""
+import argparse
+import os
+import signal
+import socket
+import threading
+from driver_pool import DriverPool
+from scraper import AdvancedContactExtractor
+from pacing import Pacer
+from cache import ResultCache
+from resource_blocking import ResourceBlocker
+from watchdog import DriverWatchdog
+from workqueue import open_work_queue
+
+
+class Worker:
+    """Leases place tasks, extracts them on its own driver and reports results"""
+
+    def __init__(self, work_queue, driver_pool, cache=None, visibility_timeout=300, poll_interval=2.0,
+                 place_timeout=180):
+        self.work_queue = work_queue
+        self.driver_pool = driver_pool
+        self.cache = cache
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.pacer = Pacer()
+        self.watchdog = DriverWatchdog(max_rss_mb=driver_pool.max_rss_bytes // (1024 * 1024),
+                                       place_timeout=place_timeout)
+        self.stopping = threading.Event()
+        self.processed = 0
+
+    def keep_leased(self, task, done):
+        """Extend the lease while the task is still being worked on"""
+        while not done.wait(self.visibility_timeout / 3):
+            try:
+                self.work_queue.extend(task, self.worker_id, self.visibility_timeout)
+            except Exception as e:
+                print(f"Lease extension error: {e}")
+
+    def process(self, task):
+        """Extract one task's place; True when a page was loaded, so the caller should pace"""
+        payload = task.payload
+        done = threading.Event()
+        threading.Thread(target=self.keep_leased, args=(task, done), daemon=True).start()
+
+        driver = self.driver_pool.checkout()
+        extractor = None
+        try:
+            extractor = AdvancedContactExtractor(
+                search_query=payload["search_query"],
+                visit_websites=payload.get("visit_websites", True),
+                driver=driver,
+                driver_pool=self.driver_pool,
+                pacer=self.pacer,
+                cache=self.cache,
+                cache_mode=payload.get("cache_mode", "use"),
+                resource_blocker=ResourceBlocker(enabled=payload.get("block_resources", True)),
+                watchdog=self.watchdog
+            )
+            business_data = extractor.extract_business_contacts(payload["url"])
+            if not extractor.last_from_cache:
+                extractor.check_driver()
+        finally:
+            done.set()
+            if extractor is None:
+                self.driver_pool.checkin(driver)
+            else:
+                self.driver_pool.checkin(extractor.driver, extractor.pages_loaded)
+
+        if business_data:
+            self.work_queue.complete(task, self.worker_id, business_data.to_dict())
+        else:
+            self.work_queue.fail(task, self.worker_id, "extraction failed")
+        self.processed += 1
+        return not extractor.last_from_cache
+
+    def run(self):
+        print(f"✓ Worker {self.worker_id} started")
+        while not self.stopping.is_set():
+            task = self.work_queue.lease(self.worker_id, self.visibility_timeout)
+            if task is None:
+                self.stopping.wait(self.poll_interval)
+                continue
+
+            loaded_page = True
+            try:
+                loaded_page = self.process(task)
+            except Exception as e:
+                print(f"Task {task.task_id} error: {e}")
+                self.work_queue.fail(task, self.worker_id, str(e))
+            if loaded_page:
+                self.pacer.pause()
+        print(f"Worker {self.worker_id} stopped after {self.processed} tasks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Maps scraper worker")
+    parser.add_argument("--queue-url", default=os.environ.get("WORK_QUEUE_URL", "sqlite:///scraper_queue.db"))
+    parser.add_argument("--visibility-timeout", type=float,
+                        default=float(os.environ.get("WORK_VISIBILITY_TIMEOUT", "300")))
+    args = parser.parse_args()
+
+    work_queue = open_work_queue(args.queue_url, max_attempts=int(os.environ.get("PLACE_MAX_ATTEMPTS", "3")))
+    driver_pool = DriverPool(
+        size=1,
+        max_pages=int(os.environ.get("DRIVER_MAX_PAGES", "200")),
+        max_rss_mb=int(os.environ.get("DRIVER_MAX_RSS_MB", "1500")),
+    )
+    driver_pool.start()
+    cache = ResultCache(
+        path=os.environ.get("CACHE_PATH", "scraper_cache.db"),
+        ttl=float(os.environ.get("CACHE_TTL_HOURS", "168")) * 3600,
+        max_entries=int(os.environ.get("CACHE_MAX_ENTRIES", "50000")),
+    )
+    worker = Worker(work_queue, driver_pool, cache=cache, visibility_timeout=args.visibility_timeout,
+                    poll_interval=float(os.environ.get("WORK_POLL_SECONDS", "2")),
+                    place_timeout=float(os.environ.get("DRIVER_PLACE_TIMEOUT", "180")))
+
+    # Finish the task in hand, then exit
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stopping.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stopping.set())
+    try:
+        worker.run()
+    finally:
+        driver_pool.shutdown()
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Task:
+    """A leased unit of work: one place of one job"""
+
+    __slots__ = ("task_id", "job_id", "seq", "payload", "attempts")
+
+    def __init__(self, task_id, job_id, seq, payload, attempts):
+        self.task_id = task_id
+        self.job_id = job_id
+        self.seq = seq
+        self.payload = payload
+        self.attempts = attempts
+
+
+class WorkQueue(ABC):
+    """Place-level task queue between the API process and scraper workers
+
+    A leased task is invisible to other workers until its visibility timeout
+    runs out; a worker that crashes mid-task therefore has the task redelivered.
+    Networked backends implement the same methods.
+    """
+
+    @abstractmethod
+    def enqueue(self, job_id, payloads):
+        """Add one task per payload; seq is the payload's position"""
+
+    @abstractmethod
+    def lease(self, worker_id, visibility_timeout):
+        """Next available Task, or None when the queue is empty"""
+
+    @abstractmethod
+    def extend(self, task, worker_id, visibility_timeout):
+        """Keep a long-running task leased"""
+
+    @abstractmethod
+    def complete(self, task, worker_id, result):
+        """Store the result of a leased task"""
+
+    @abstractmethod
+    def fail(self, task, worker_id, error):
+        """Release a leased task for redelivery, or bury it once out of attempts"""
+
+    @abstractmethod
+    def results(self, job_id, after=0):
+        """(cursor, seq, result) of tasks completed after the given cursor, in completion order"""
+
+    @abstractmethod
+    def iter_results(self, job_id, page_size=500):
+        """(seq, result) of a job's completed tasks in seq order, read page by page"""
+
+    @abstractmethod
+    def latest_job(self, prefix):
+        """Most recently enqueued job id starting with prefix, or None"""
+
+    @abstractmethod
+    def counts(self, job_id):
+        """Task counts by status for a job"""
+
+    @abstractmethod
+    def cancel(self, job_id):
+        """Drop a job's tasks that have not been picked up"""
+
+    @abstractmethod
+    def last_activity(self):
+        """Time of the latest lease, heartbeat, completion or failure by any worker, or None"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """WorkQueue on a local SQLite file, shared by processes on one machine"""
+
+    def __init__(self, path="scraper_queue.db", max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS work_tasks (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_until REAL,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS work_results (
+                result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                result TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS work_activity (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS work_results_job ON work_results (job_id, result_id);
+            CREATE INDEX IF NOT EXISTS work_results_seq ON work_results (job_id, seq);
+            CREATE INDEX IF NOT EXISTS work_tasks_status ON work_tasks (status, lease_until);
+            CREATE INDEX IF NOT EXISTS work_tasks_job ON work_tasks (job_id, status, seq);
+        """)
+
+    def _transaction(self, statements):
+        """Run statements(conn) inside an IMMEDIATE transaction so leases never overlap"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _touch(conn):
+        conn.execute("INSERT OR REPLACE INTO work_activity (id, at) VALUES (0, ?)", (time.time(),))
+
+    def enqueue(self, job_id, payloads):
+        self._transaction(lambda conn: conn.executemany(
+            "INSERT INTO work_tasks (job_id, seq, payload) VALUES (?, ?, ?)",
+            [(job_id, seq, json.dumps(payload)) for seq, payload in enumerate(payloads)]))
+
+    def lease(self, worker_id, visibility_timeout):
+        def statements(conn):
+            now = time.time()
+            # Expired leases belong to crashed or stuck workers
+            conn.execute(
+                "UPDATE work_tasks SET status = 'dead', error = 'lease expired too often' "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts))
+            row = conn.execute(
+                "SELECT task_id, job_id, seq, payload, attempts FROM work_tasks "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY task_id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE work_tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_until = ? "
+                "WHERE task_id = ?", (worker_id, now + visibility_timeout, row[0]))
+            self._touch(conn)
+            return Task(row[0], row[1], row[2], json.loads(row[3]), row[4] + 1)
+        return self._transaction(statements)
+
+    def extend(self, task, worker_id, visibility_timeout):
+        def statements(conn):
+            conn.execute(
+                "UPDATE work_tasks SET lease_until = ? WHERE task_id = ? AND lease_owner = ? AND status = 'leased'",
+                (time.time() + visibility_timeout, task.task_id, worker_id))
+            self._touch(conn)
+        self._transaction(statements)
+
+    def complete(self, task, worker_id, result):
+        def statements(conn):
+            updated = conn.execute(
+                "UPDATE work_tasks SET status = 'done', error = NULL, lease_until = NULL "
+                "WHERE task_id = ? AND lease_owner = ? AND status = 'leased'",
+                (task.task_id, worker_id)).rowcount
+            # A worker whose lease expired and was redelivered must not store a duplicate
+            if updated:
+                conn.execute("INSERT INTO work_results (job_id, seq, result) VALUES (?, ?, ?)",
+                             (task.job_id, task.seq, json.dumps(result)))
+            self._touch(conn)
+        self._transaction(statements)
+
+    def fail(self, task, worker_id, error):
+        status = 'dead' if task.attempts >= self.max_attempts else 'queued'
+
+        def statements(conn):
+            conn.execute(
+                "UPDATE work_tasks SET status = ?, error = ?, lease_until = NULL "
+                "WHERE task_id = ? AND lease_owner = ? AND status = 'leased'",
+                (status, error, task.task_id, worker_id))
+            self._touch(conn)
+        self._transaction(statements)
+
+    def results(self, job_id, after=0):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result_id, seq, result FROM work_results WHERE job_id = ? AND result_id > ? ORDER BY result_id",
+                (job_id, after)).fetchall()
+        return [(result_id, seq, json.loads(result)) for result_id, seq, result in rows]
+
+    def iter_results(self, job_id, page_size=500):
+        after = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, result FROM work_results WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (job_id, after, page_size)).fetchall()
+            for seq, result in rows:
+                yield seq, json.loads(result)
+            if len(rows) < page_size:
+                return
+            after = rows[-1][0]
+
+    def latest_job(self, prefix):
+        # A range on job_id keeps the lookup on the index; chr(0x10ffff) sorts after any suffix
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id FROM work_tasks WHERE job_id >= ? AND job_id < ? ORDER BY task_id DESC LIMIT 1",
+                (prefix, prefix + chr(0x10ffff))).fetchone()
+        return row[0] if row else None
+
+    def counts(self, job_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM work_tasks WHERE job_id = ? GROUP BY status", (job_id,)).fetchall()
+        return dict(rows)
+
+    def cancel(self, job_id):
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE work_tasks SET status = 'cancelled' WHERE job_id = ? AND status = 'queued'", (job_id,)))
+
+    def last_activity(self):
+        with self._lock:
+            row = self._conn.execute("SELECT at FROM work_activity WHERE id = 0").fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_work_queue(url, max_attempts=3):
+    """WorkQueue for a URL such as sqlite:///scraper_queue.db"""
+    if url.startswith("sqlite:///"):
+        return SQLiteWorkQueue(url[len("sqlite:///"):], max_attempts=max_attempts)
+    raise ValueError(f"Unsupported work queue URL: {url}")